@@ -5,7 +5,8 @@ import torch.nn.functional as F
 import numpy as np
 import random
 from collections import deque, namedtuple
-from typing import Dict, List, Tuple, Optional
+from itertools import islice
+from typing import Dict, List, Tuple, Optional, Union
 import logging
 import json
 from dataclasses import dataclass
@@ -38,6 +39,46 @@ class SFCAction:
     priority: int = 5
     parameters: Optional[Dict] = None
 
+@dataclass(slots=True)
+class StepResult:
+    """Outcome of executing an SFCAction, consumed by calculate_reward"""
+    sfc_satisfied: bool = False
+    sfc_dropped: bool = False
+    action_invalid: bool = False
+    unnecessary: bool = False
+    resource_efficiency: float = 0.0
+    sla_violation: bool = False
+    
+    def reset(self):
+        """Clear all fields so the instance can be reused for the next step"""
+        self.sfc_satisfied = False
+        self.sfc_dropped = False
+        self.action_invalid = False
+        self.unnecessary = False
+        self.resource_efficiency = 0.0
+        self.sla_violation = False
+
+def build_state_schema(vnf_types: Tuple[str, ...], state_dim: int) -> Dict[str, int]:
+    """Observation-vector slot of each SFCState entry, keyed '<field>.<key>'.
+    
+    Layout: DC resources, installed VNFs, SFC count, pending requests, VNF
+    load. Entries past state_dim are dropped; unused slots stay zero.
+    """
+    names = [
+        'dc_resources.cpu_available',
+        'dc_resources.memory_available',
+        'dc_resources.network_bandwidth'
+    ]
+    names += [f'installed_vnfs.{vnf_type}' for vnf_type in vnf_types]
+    names.append('sfc_allocations')
+    names += [
+        'pending_requests.request_count',
+        'pending_requests.bandwidth_requirements',
+        'pending_requests.latency_constraints'
+    ]
+    names += [f'current_load.{vnf_type}' for vnf_type in vnf_types]
+    return {name: slot for slot, name in enumerate(names[:state_dim])}
+
 class AttentionLayer(nn.Module):
     """Multi-head attention mechanism for state processing"""
     def __init__(self, input_dim: int, num_heads: int = 8, dropout: float = 0.1):
@@ -121,45 +162,95 @@ class DQNNetwork(nn.Module):
         return q_values
 
 class PrioritizedReplayBuffer:
-    """Prioritized experience replay buffer"""
-    def __init__(self, capacity: int = 10000, alpha: float = 0.6, beta: float = 0.4):
+    """Prioritized experience replay buffer.
+    
+    Experiences are (state_vec, action_idx, reward, next_state_vec, done) and
+    live in preallocated ring-buffer arrays, one per field, so a sampled batch
+    is a handful of fancy-indexing copies. Observations are stored as
+    state_dtype (float32 by default), clipped to its finite range and
+    returned as float32. float16 halves the sampling path's memory traffic
+    but is opt-in: it rounds values above 2048 and saturates at 65504, so it
+    only suits observations whose features all stay small.
+    """
+    def __init__(self, capacity: int = 10000, state_dim: int = 50,
+                 alpha: float = 0.6, beta: float = 0.4, state_dtype=np.float32):
         self.capacity = capacity
         self.alpha = alpha
         self.beta = beta
-        self.buffer = deque(maxlen=capacity)
-        self.priorities = deque(maxlen=capacity)
+        # Counters such as request_count grow without bound; with a narrow
+        # state_dtype clip rather than overflow to inf
+        self._state_max = float(np.finfo(state_dtype).max)
+        self.states = np.zeros((capacity, state_dim), dtype=state_dtype)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_dim), dtype=state_dtype)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.priorities = np.zeros(capacity, dtype=np.float64)
+        self.max_priority = 1.0  # new experiences are sampled at least once soon
+        self.pos = 0
+        self.size = 0
         self.eps = 1e-6
+    
+    def __len__(self) -> int:
+        return self.size
         
     def add(self, experience: Tuple, priority: float = None):
-        if priority is None:
-            priority = max(self.priorities) if self.priorities else 1.0
-        
-        self.buffer.append(experience)
-        self.priorities.append(priority)
-        
-    def sample(self, batch_size: int) -> Tuple[List, List[int], List[float]]:
-        if len(self.buffer) < batch_size:
-            return list(self.buffer), [1.0] * len(self.buffer), [1.0] * len(self.buffer)
-        
-        # Calculate sampling probabilities
-        priorities = np.array(self.priorities)
-        probs = priorities ** self.alpha
-        probs /= probs.sum()
-        
-        # Sample indices
-        indices = np.random.choice(len(self.buffer), batch_size, p=probs)
-        experiences = [self.buffer[idx] for idx in indices]
-        
-        # Calculate importance sampling weights
-        weights = (len(self.buffer) * probs[indices]) ** (-self.beta)
-        weights /= weights.max()
-        
-        return experiences, indices, weights
+        state, action, reward, next_state, done = experience
+        slot = self.pos
+        limit = self._state_max
+        self.states[slot] = np.clip(state, -limit, limit)
+        self.actions[slot] = action
+        self.rewards[slot] = reward
+        self.next_states[slot] = np.clip(next_state, -limit, limit)
+        self.dones[slot] = done
+        self.priorities[slot] = self.max_priority if priority is None else priority
+        self.pos = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
     
-    def update_priorities(self, indices: List[int], priorities: List[float]):
-        for idx, priority in zip(indices, priorities):
-            if idx < len(self.priorities):
-                self.priorities[idx] = priority + self.eps
+    def add_batch(self, experiences: List[Tuple]):
+        """Add several experiences at the current maximum priority"""
+        if not experiences:
+            return
+        states, actions, rewards, next_states, dones = zip(*experiences)
+        slots = (self.pos + np.arange(len(experiences))) % self.capacity
+        limit = self._state_max
+        self.states[slots] = np.clip(np.stack(states), -limit, limit)
+        self.actions[slots] = actions
+        self.rewards[slots] = rewards
+        self.next_states[slots] = np.clip(np.stack(next_states), -limit, limit)
+        self.dones[slots] = dones
+        self.priorities[slots] = self.max_priority
+        self.pos = int(slots[-1] + 1) % self.capacity
+        self.size = min(self.size + len(experiences), self.capacity)
+        
+    def sample(self, batch_size: int) -> Tuple[Tuple[np.ndarray, ...], np.ndarray, np.ndarray]:
+        """Sample (states, actions, rewards, next_states, dones) arrays with
+        their slot indices and importance-sampling weights"""
+        size = self.size
+        if size < batch_size:
+            indices = np.arange(size)
+            weights = np.ones(size)
+        else:
+            # Calculate sampling probabilities
+            probs = self.priorities[:size] ** self.alpha
+            probs /= probs.sum()
+            
+            # Sample indices
+            indices = np.random.choice(size, batch_size, p=probs)
+            
+            # Calculate importance sampling weights
+            weights = (size * probs[indices]) ** (-self.beta)
+            weights /= weights.max()
+        
+        batch = (self.states[indices].astype(np.float32), self.actions[indices],
+                 self.rewards[indices], self.next_states[indices].astype(np.float32),
+                 self.dones[indices])
+        return batch, indices, weights
+    
+    def update_priorities(self, indices: np.ndarray, priorities: np.ndarray):
+        priorities = np.asarray(priorities, dtype=np.float64) + self.eps
+        self.priorities[indices] = priorities
+        self.max_priority = max(self.max_priority, float(priorities.max()))
 
 class DRLAgent:
     """Deep Reinforcement Learning Agent for VNF Orchestration"""
@@ -178,12 +269,17 @@ class DRLAgent:
         self.target_network = DQNNetwork(self.state_dim, self.action_dim).to(self.device)
         self.target_network.load_state_dict(self.q_network.state_dict())
         
+        # Traced copy of the Q-network used for acting; shares its parameters
+        self._policy = self._trace_policy() if config.get('jit', True) else None
+        
         # Optimizer
         self.optimizer = optim.Adam(self.q_network.parameters(), lr=config.get('learning_rate', 0.001))
         
         # Experience replay
         self.replay_buffer = PrioritizedReplayBuffer(
-            capacity=config.get('replay_capacity', 10000)
+            capacity=config.get('replay_capacity', 10000),
+            state_dim=self.state_dim,
+            state_dtype=np.dtype(config.get('replay_state_dtype', 'float32'))
         )
         
         # Training parameters
@@ -196,13 +292,32 @@ class DRLAgent:
         
         # Training state
         self.training_step = 0
-        self.episode_rewards = []
-        self.losses = []
+        self.episode_rewards = deque(maxlen=config.get('reward_history', 10_000))
+        self.losses = deque(maxlen=config.get('loss_history', 100_000))
         
         # VNF types and actions mapping
-        self.vnf_types = ['firewall', 'antivirus', 'spamfilter', 'encryption_gateway', 'content_filtering', 'mail']
+        self.vnf_types = ('firewall', 'antivirus', 'spamfilter', 'encryption_gateway', 'content_filtering', 'mail')
         self.action_mapping = self._create_action_mapping()
-        
+        self._action_index = {
+            (action.action_type, action.vnf_type): idx for idx, action in self.action_mapping.items()
+        }
+        self.state_schema = build_state_schema(self.vnf_types, self.state_dim)
+        self._encode_state = self._compile_state_encoder()
+        
+    def _trace_policy(self):
+        """Trace the Q-network in eval mode for action selection"""
+        example = torch.zeros(1, self.state_dim, device=self.device)
+        was_training = self.q_network.training
+        self.q_network.eval()
+        try:
+            with torch.no_grad():
+                return torch.jit.trace(self.q_network, example, check_trace=False)
+        except Exception as e:
+            logger.warning(f"TorchScript tracing failed, acting with eager network: {e}")
+            return None
+        finally:
+            self.q_network.train(was_training)
+    
     def _create_action_mapping(self) -> Dict[int, SFCAction]:
         """Create mapping from action indices to SFCAction objects"""
         mapping = {}
@@ -223,42 +338,51 @@ class DRLAgent:
         
         return mapping
     
-    def state_to_tensor(self, state: SFCState) -> torch.Tensor:
-        """Convert SFCState to tensor representation"""
-        # Flatten state into a single vector
-        state_vector = []
-        
-        # DC resources
-        state_vector.extend([
-            state.dc_resources.get('cpu_available', 0.0),
-            state.dc_resources.get('memory_available', 0.0),
-            state.dc_resources.get('network_bandwidth', 0.0)
-        ])
-        
-        # Installed VNFs
-        for vnf_type in self.vnf_types:
-            state_vector.append(state.installed_vnfs.get(vnf_type, 0))
-        
-        # SFC allocations (simplified)
-        sfc_count = len(state.sfc_allocations)
-        state_vector.append(sfc_count)
-        
-        # Pending requests
-        state_vector.extend([
-            state.pending_requests.get('request_count', 0.0),
-            state.pending_requests.get('bandwidth_requirements', 0.0),
-            state.pending_requests.get('latency_constraints', 0.0)
-        ])
-        
-        # Current load
-        for vnf_type in self.vnf_types:
-            state_vector.append(state.current_load.get(vnf_type, 0.0))
-        
-        # Pad to state_dim
-        while len(state_vector) < self.state_dim:
-            state_vector.append(0.0)
-        
-        return torch.FloatTensor(state_vector[:self.state_dim]).unsqueeze(0).to(self.device)
+    def _compile_state_encoder(self):
+        """Generate a straight-line state encoder specialised to state_schema"""
+        aliases = {
+            'dc_resources': 'dc',
+            'installed_vnfs': 'installed',
+            'pending_requests': 'pending',
+            'current_load': 'load'
+        }
+        fields = []
+        for name in self.state_schema:
+            if name == 'sfc_allocations':
+                fields.append("len(state.sfc_allocations)")
+            else:
+                field, key = name.split('.', 1)
+                fields.append(f"{aliases[field]}.get({key!r}, 0.0)")
+        
+        # Slots not in the schema stay zero-padded
+        lines = [
+            "def encode(state):",
+            f"    vec = zeros({self.state_dim}, float32)",
+            "    dc = state.dc_resources",
+            "    installed = state.installed_vnfs",
+            "    pending = state.pending_requests",
+            "    load = state.current_load",
+        ]
+        lines += [f"    vec[{i}] = {expr}" for i, expr in enumerate(fields)]
+        lines.append("    return vec")
+        
+        namespace = {'zeros': np.zeros, 'float32': np.float32}
+        exec(compile("\n".join(lines), "<state_encoder>", "exec"), namespace)
+        return namespace['encode']
+    
+    def action_index(self, action: SFCAction) -> int:
+        """Index of an action in action_mapping, as stored in the replay buffer"""
+        return self._action_index[(action.action_type, action.vnf_type)]
+    
+    def encode_state(self, state: SFCState) -> np.ndarray:
+        """Encode an SFCState as the float32 observation vector the network takes"""
+        return self._encode_state(state)
+    
+    def state_to_tensor(self, state) -> torch.Tensor:
+        """Convert an SFCState, or its encode_state vector, to a batch-of-one tensor"""
+        if not isinstance(state, np.ndarray):
+            state = self._encode_state(state)
+        return torch.from_numpy(state).unsqueeze(0).to(self.device)
     
     def select_action(self, state: SFCState, training: bool = True) -> SFCAction:
         """Select action using epsilon-greedy policy"""
@@ -268,38 +392,39 @@ class DRLAgent:
         else:
             # Greedy action
             state_tensor = self.state_to_tensor(state)
-            with torch.no_grad():
-                q_values = self.q_network(state_tensor)
+            policy = self._policy if self._policy is not None else self.q_network
+            with torch.inference_mode():
+                q_values = policy(state_tensor)
                 action_idx = q_values.argmax().item()
         
         return self.action_mapping.get(action_idx, SFCAction(ActionType.WAIT, "none"))
     
-    def calculate_reward(self, action: SFCAction, state: SFCState, result: Dict) -> float:
+    def calculate_reward(self, action: SFCAction, state: Union[SFCState, np.ndarray], result: StepResult) -> float:
         """Calculate reward based on action outcome"""
         reward = 0.0
         
         # SFC satisfaction reward
-        if result.get('sfc_satisfied', False):
+        if result.sfc_satisfied:
             reward += 2.0
         
         # Penalty for dropped SFCs
-        if result.get('sfc_dropped', False):
+        if result.sfc_dropped:
             reward -= 1.5
         
         # Penalty for invalid actions
-        if result.get('action_invalid', False):
+        if result.action_invalid:
             reward -= 1.0
         
         # Penalty for unnecessary uninstallations
-        if action.action_type == ActionType.UNINSTALL and result.get('unnecessary', False):
+        if action.action_type == ActionType.UNINSTALL and result.unnecessary:
             reward -= 0.5
         
         # Bonus for efficient resource usage
-        if result.get('resource_efficiency', 0.0) > 0.8:
+        if result.resource_efficiency > 0.8:
             reward += 0.3
         
         # Penalty for SLA violations
-        if result.get('sla_violation', False):
+        if result.sla_violation:
             reward -= 0.8
         
         # Small penalty for wait actions to encourage proactive behavior
@@ -310,22 +435,20 @@ class DRLAgent:
     
     def train_step(self) -> float:
         """Perform one training step"""
-        if len(self.replay_buffer.buffer) < self.batch_size:
+        if len(self.replay_buffer) < self.batch_size:
             return 0.0
         
         # Sample batch
-        experiences, indices, weights = self.replay_buffer.sample(self.batch_size)
-        
-        # Unpack experiences
-        states, actions, rewards, next_states, dones = zip(*experiences)
+        (states, actions, rewards, next_states, dones), indices, weights = \
+            self.replay_buffer.sample(self.batch_size)
         
-        # Convert to tensors
-        state_batch = torch.cat([self.state_to_tensor(s) for s in states])
-        next_state_batch = torch.cat([self.state_to_tensor(s) for s in next_states])
-        action_batch = torch.LongTensor([list(self.action_mapping.keys())[list(self.action_mapping.values()).index(a)] for a in actions]).to(self.device)
-        reward_batch = torch.FloatTensor(rewards).to(self.device)
-        done_batch = torch.BoolTensor(dones).to(self.device)
-        weight_batch = torch.FloatTensor(weights).to(self.device)
+        # The sampled arrays are fresh contiguous copies, so wrap them directly
+        state_batch = torch.from_numpy(states).to(self.device)
+        next_state_batch = torch.from_numpy(next_states).to(self.device)
+        action_batch = torch.from_numpy(actions).to(self.device)
+        reward_batch = torch.from_numpy(rewards).to(self.device)
+        done_batch = torch.from_numpy(dones).to(self.device)
+        weight_batch = torch.from_numpy(weights.astype(np.float32)).to(self.device)
         
         # Current Q values
         current_q_values = self.q_network(state_batch).gather(1, action_batch.unsqueeze(1))
@@ -359,7 +482,13 @@ class DRLAgent:
         if self.epsilon > self.epsilon_min:
             self.epsilon *= self.epsilon_decay
         
-        return weighted_loss.item()
+        loss_value = weighted_loss.item()
+        self.losses.append(loss_value)
+        return loss_value
+    
+    def train_steps(self, steps: int) -> List[float]:
+        """Run several training steps back to back and return their losses"""
+        return [self.train_step() for _ in range(steps)]
     
     def save_model(self, filepath: str):
         """Save the trained model"""
@@ -369,8 +498,8 @@ class DRLAgent:
             'optimizer_state_dict': self.optimizer.state_dict(),
             'epsilon': self.epsilon,
             'training_step': self.training_step,
-            'episode_rewards': self.episode_rewards,
-            'losses': self.losses
+            'episode_rewards': list(self.episode_rewards),
+            'losses': list(self.losses)
         }, filepath)
         logger.info(f"Model saved to {filepath}")
     
@@ -382,8 +511,8 @@ class DRLAgent:
         self.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
         self.epsilon = checkpoint['epsilon']
         self.training_step = checkpoint['training_step']
-        self.episode_rewards = checkpoint['episode_rewards']
-        self.losses = checkpoint['losses']
+        self.episode_rewards = deque(checkpoint['episode_rewards'], maxlen=self.episode_rewards.maxlen)
+        self.losses = deque(checkpoint['losses'], maxlen=self.losses.maxlen)
         logger.info(f"Model loaded from {filepath}")
     
     def get_stats(self) -> Dict:
@@ -391,7 +520,7 @@ class DRLAgent:
         return {
             'epsilon': self.epsilon,
             'training_step': self.training_step,
-            'replay_buffer_size': len(self.replay_buffer.buffer),
-            'episode_rewards': self.episode_rewards[-100:] if self.episode_rewards else [],
-            'losses': self.losses[-100:] if self.losses else []
+            'replay_buffer_size': len(self.replay_buffer),
+            'episode_rewards': list(islice(self.episode_rewards, max(len(self.episode_rewards) - 100, 0), None)),
+            'losses': list(islice(self.losses, max(len(self.losses) - 100, 0), None))
         }
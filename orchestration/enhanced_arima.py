@@ -1,21 +1,186 @@
+import os
+import hashlib
 import numpy as np
 import pandas as pd
 from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.stattools import adfuller, kpss
 from statsmodels.stats.diagnostic import acorr_ljungbox
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 from scipy import stats
-import matplotlib.pyplot as plt
+from joblib import Parallel, delayed, effective_n_jobs
+from threadpoolctl import threadpool_limits
 import logging
+import math
+from collections import deque
 from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """Pass-through used when numba is not installed"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Optimizer settings for candidate screening and for the final model fit
+_SCREEN_FIT_KWARGS = {'method': 'nm', 'maxiter': 50, 'disp': 0}
+_FINAL_FIT_KWARGS = {'method': 'lbfgs', 'maxiter': 500, 'disp': 0}
+
+def _fit_one(data: np.ndarray, order: Tuple[int, int, int],
+             seasonal_order: Tuple[int, int, int, int]) -> Optional[Tuple[float, Tuple, Tuple]]:
+    """Screen a single ARIMA candidate with a cheap, loosely converged fit;
+    returns (aic, order, seasonal_order) or None on failure"""
+    try:
+        model = ARIMA(data, order=order, seasonal_order=seasonal_order, concentrate_scale=True)
+        with threadpool_limits(limits=1, user_api='blas'):
+            fitted_model = model.fit(method_kwargs=dict(_SCREEN_FIT_KWARGS), low_memory=True)
+    except (ValueError, np.linalg.LinAlgError):
+        return None
+    return fitted_model.aic, order, seasonal_order
+
+def _fit_chunk(data: np.ndarray, candidates: List[Tuple[Tuple, Tuple]]) -> List[Optional[Tuple[float, Tuple, Tuple]]]:
+    """Screen a batch of (order, seasonal_order) candidates against one copy of the data"""
+    return [_fit_one(data, order, seasonal_order) for order, seasonal_order in candidates]
+
+def _valid(p: int, q: int, P: int, D: int, Q: int, s: int, n: int) -> bool:
+    """Whether an order is worth fitting: seasonal terms need a real season and the
+    lag span must leave enough observations"""
+    if s <= 1 and (P or D or Q or s):
+        # statsmodels only takes a (0, 0, 0, 0) seasonal order without a season
+        return False
+    return p + q + (P + Q) * s < n // 3
+
+# Shortest series that gets a 12-period seasonal component in the order search
+_MIN_SEASONAL_LENGTH = 50
+
+# MacKinnon (1994) response-surface coefficients for the constant-only ADF
+# regression with one variable, as used by statsmodels' mackinnonp
+_ADF_TAU_MAX = 2.74
+_ADF_TAU_MIN = -18.83
+_ADF_TAU_STAR = -1.61
+_ADF_TAU_SMALLP = (2.1659, 1.4412, 3.8269e-2)
+_ADF_TAU_LARGEP = (1.7339, 9.3202e-1, -1.2745e-1, -1.0368e-2)
+
+# KPSS level-stationarity critical values (Kwiatkowski et al. 1992, table 1)
+_KPSS_CRIT = np.array([0.347, 0.463, 0.574, 0.739])
+_KPSS_PVALS = np.array([0.10, 0.05, 0.025, 0.01])
+
+@njit(cache=True)
+def _ols_ssr_tstat(X: np.ndarray, y: np.ndarray, col: int) -> Tuple[float, float]:
+    """OLS via normal equations; returns (ssr, t-statistic of column col)"""
+    xtx = X.T @ X
+    beta = np.linalg.solve(xtx, X.T @ y)
+    resid = y - X @ beta
+    ssr = resid @ resid
+    sigma2 = ssr / (X.shape[0] - X.shape[1])
+    se = np.sqrt(sigma2 * np.linalg.inv(xtx)[col, col])
+    return ssr, beta[col] / se
+
+@njit(cache=True)
+def _adf_design(x: np.ndarray, xdiff: np.ndarray, lags: int, ncols: int) -> np.ndarray:
+    """ADF regressors [const, lagged level, lagged differences...] for a given lag count"""
+    nobs = xdiff.shape[0] - lags
+    X = np.empty((nobs, ncols))
+    X[:, 0] = 1.0
+    X[:, 1] = x[lags:lags + nobs]
+    for i in range(1, ncols - 1):
+        X[:, i + 1] = xdiff[lags - i:lags - i + nobs]
+    return X
+
+@njit(cache=True)
+def _adf_kernel(x: np.ndarray, maxlag: int) -> Tuple[float, int]:
+    """ADF t-statistic with constant and AIC lag selection; returns (stat, used lag)"""
+    xdiff = x[1:] - x[:-1]
+    
+    # Select the lag by AIC, all candidates sharing the maxlag-trimmed sample
+    X = _adf_design(x, xdiff, maxlag, maxlag + 2)
+    y = xdiff[maxlag:]
+    nobs = y.shape[0]
+    best_aic = np.inf
+    best_lag = 0
+    for lag in range(maxlag + 1):
+        k = lag + 2
+        ssr, _ = _ols_ssr_tstat(np.ascontiguousarray(X[:, :k]), y, 1)
+        aic = nobs * (np.log(2.0 * np.pi) + np.log(ssr / nobs) + 1.0) + 2.0 * k
+        if aic < best_aic:
+            best_aic = aic
+            best_lag = lag
+    
+    # Re-estimate on the longest sample the chosen lag allows
+    X = _adf_design(x, xdiff, best_lag, best_lag + 2)
+    _, tstat = _ols_ssr_tstat(X, xdiff[best_lag:], 1)
+    return tstat, best_lag
+
+@njit(cache=True)
+def _kpss_kernel(x: np.ndarray) -> Tuple[float, int]:
+    """KPSS level-stationarity statistic with automatic bandwidth; returns (stat, lags)"""
+    nobs = x.shape[0]
+    resids = x - x.mean()
+    
+    # Hobijn et al. (1998) automatic bandwidth selection
+    covlags = int(nobs ** (2.0 / 9.0))
+    s0 = (resids @ resids) / nobs
+    s1 = 0.0
+    for i in range(1, covlags + 1):
+        prod = (resids[i:] @ resids[:nobs - i]) / (nobs / 2.0)
+        s0 += prod
+        s1 += i * prod
+    s_hat = s1 / s0
+    lags = int(1.1447 * (s_hat * s_hat) ** (1.0 / 3.0) * nobs ** (1.0 / 3.0))
+    lags = min(lags, nobs - 1)
+    
+    # Long-run variance with Bartlett weights
+    sigma = resids @ resids
+    for i in range(1, lags + 1):
+        sigma += 2.0 * (resids[i:] @ resids[:nobs - i]) * (1.0 - i / (lags + 1.0))
+    sigma /= nobs
+    
+    partial = np.cumsum(resids)
+    eta = (partial @ partial) / (nobs * nobs)
+    return eta / sigma, lags
+
+def _mackinnonp(teststat: float) -> float:
+    """Approximate ADF p-value for the constant-only regression"""
+    if teststat > _ADF_TAU_MAX:
+        return 1.0
+    if teststat < _ADF_TAU_MIN:
+        return 0.0
+    coef = _ADF_TAU_SMALLP if teststat <= _ADF_TAU_STAR else _ADF_TAU_LARGEP
+    z = sum(c * teststat ** i for i, c in enumerate(coef))
+    return 0.5 * math.erfc(-z / math.sqrt(2.0))
+
+def _adf_test(data: np.ndarray) -> Tuple[float, float]:
+    """Augmented Dickey-Fuller test (constant, AIC lag selection); returns (statistic, p-value)"""
+    x = np.ascontiguousarray(data, dtype=np.float64)
+    nobs = x.shape[0]
+    maxlag = min(nobs // 2 - 2, int(np.ceil(12.0 * (nobs / 100.0) ** 0.25)))
+    if maxlag < 0:
+        raise ValueError("sample size is too short to use selected regression component")
+    statistic, _ = _adf_kernel(x, maxlag)
+    return statistic, _mackinnonp(statistic)
+
+def _kpss_test(data: np.ndarray) -> Tuple[float, float]:
+    """KPSS level-stationarity test; returns (statistic, p-value interpolated from the table)"""
+    statistic, _ = _kpss_kernel(np.ascontiguousarray(data, dtype=np.float64))
+    return statistic, float(np.interp(statistic, _KPSS_CRIT, _KPSS_PVALS))
+
+# Stepwise neighbourhood moves over (p, q, P, Q)
+_STEPWISE_MOVES = (
+    (1, 0, 0, 0), (-1, 0, 0, 0), (0, 1, 0, 0), (0, -1, 0, 0),
+    (1, 1, 0, 0), (-1, -1, 0, 0),
+    (0, 0, 1, 0), (0, 0, -1, 0), (0, 0, 0, 1), (0, 0, 0, -1),
+    (0, 0, 1, 1), (0, 0, -1, -1),
+)
+
 @dataclass
 class ARIMAModel:
     """ARIMA model configuration"""
@@ -45,10 +210,12 @@ class EnhancedARIMAForecaster:
         self.config = config or {}
         self.model = None
         self.fitted_model = None
-        self.history = []
-        self.forecast_history = []
         self.model_performance = []
         
+        # Figure reused across plot_forecast calls
+        self._fig = None
+        self._ax = None
+        
         # Default parameters
         self.min_history_length = self.config.get('min_history_length', 20)
         self.max_history_length = self.config.get('max_history_length', 1000)
@@ -56,6 +223,33 @@ class EnhancedARIMAForecaster:
         self.confidence_level = self.config.get('confidence_level', 0.95)
         self.auto_optimize = self.config.get('auto_optimize', True)
         
+        # History ring buffer, stored as parallel value/timestamp arrays
+        self._values = np.empty(self.max_history_length, dtype=np.float64)
+        self._timestamps = np.empty(self.max_history_length, dtype=object)
+        self._head = 0  # next write position
+        self._count = 0
+        
+        # Most recent forecasts; older entries are evicted automatically
+        self.forecast_history = deque(maxlen=self.config.get('max_forecast_history', 100))
+        self.n_jobs = self.config.get('n_jobs', -1)
+        self.stepwise = self.config.get('stepwise', True)
+        self.stepwise_tolerance = self.config.get('stepwise_tolerance', 0.01)
+        self.early_stop_patience = self.config.get('early_stop_patience', 8)
+        self.early_stop_delta = self.config.get('early_stop_delta', 0.01)
+        
+        # Order search results are reused between refits (see _select_model_config)
+        self.search_interval = self.config.get('search_interval', 20)
+        self.residual_tolerance = self.config.get('residual_tolerance', 1.5)
+        self._best_config: Optional[ARIMAModel] = None
+        self._fits_since_search = 0
+        self._search_rmse: Optional[float] = None
+        self._force_search = False
+        self._diagnostics: Dict[str, float] = {}
+        
+        # Differencing order of the most recently analysed series (see _determine_differencing)
+        self._differencing_key = None
+        self._differencing_order = None
+        
         # Seasonal patterns
         self.seasonal_patterns = {
             'hourly': 24,
@@ -65,39 +259,73 @@ class EnhancedARIMAForecaster:
             'quarterly': 4
         }
         
+    @property
+    def confidence_level(self) -> float:
+        """Confidence level for forecast intervals"""
+        return self._confidence_level
+    
+    @confidence_level.setter
+    def confidence_level(self, value: float):
+        # The matching two-sided z-score is cached for _calculate_confidence_intervals
+        self._confidence_level = value
+        self._z_score = stats.norm.ppf((1 + value) / 2)
+    
+    @property
+    def history_length(self) -> int:
+        """Number of data points currently held in history"""
+        return self._count
+    
+    @property
+    def history(self) -> List[Dict]:
+        """History as a list of {'timestamp', 'value'} dicts, oldest first"""
+        order = self._ordered_indices()
+        return [{'timestamp': self._timestamps[i], 'value': float(self._values[i])} for i in order]
+    
+    def _ordered_indices(self) -> np.ndarray:
+        """Ring-buffer positions in chronological order"""
+        if self._count < self.max_history_length:
+            return np.arange(self._count)
+        return (np.arange(self._count) + self._head) % self.max_history_length
+    
     def add_data_point(self, value: float, timestamp: Optional[str] = None):
         """Add new data point to history"""
-        if timestamp:
-            self.history.append({'timestamp': timestamp, 'value': value})
-        else:
-            self.history.append({'timestamp': len(self.history), 'value': value})
-        
-        # Maintain history length
-        if len(self.history) > self.max_history_length:
-            self.history = self.history[-self.max_history_length:]
-        
-        logger.debug(f"Added data point: {value}, history length: {len(self.history)}")
+        head = self._head
+        self._values[head] = value
+        self._timestamps[head] = timestamp if timestamp else self._count
+        
+        # Oldest point is overwritten once the buffer is full
+        self._head = (head + 1) % self.max_history_length
+        if self._count < self.max_history_length:
+            self._count += 1
+        
+        # Extend the fitted model through the Kalman filter, keeping its parameters
+        if self.fitted_model is not None:
+            try:
+                self.fitted_model = self.fitted_model.append([value], refit=False)
+            except Exception as e:
+                logger.warning(f"Could not append observation to fitted model: {e}")
+                self.fitted_model = None
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Added data point: %s, history length: %d", value, self._count)
     
     def _prepare_data(self) -> np.ndarray:
         """Prepare data for ARIMA modeling"""
-        if len(self.history) < self.min_history_length:
+        if self._count < self.min_history_length:
             raise ValueError(f"Insufficient data. Need at least {self.min_history_length} points")
         
-        # Extract values
-        values = [point['value'] for point in self.history]
-        return np.array(values)
+        # Contiguous chronological copy of the ring buffer
+        if self._count < self.max_history_length:
+            return self._values[:self._count].copy()
+        return np.concatenate((self._values[self._head:], self._values[:self._head]))
     
     def _check_stationarity(self, data: np.ndarray) -> Dict[str, float]:
         """Check data stationarity using ADF and KPSS tests"""
         # Augmented Dickey-Fuller test
-        adf_result = adfuller(data)
-        adf_statistic = adf_result[0]
-        adf_pvalue = adf_result[1]
+        adf_statistic, adf_pvalue = _adf_test(data)
         
         # KPSS test
-        kpss_result = kpss(data)
-        kpss_statistic = kpss_result[0]
-        kpss_pvalue = kpss_result[1]
+        kpss_statistic, kpss_pvalue = _kpss_test(data)
         
         return {
             'adf_statistic': adf_statistic,
@@ -108,74 +336,205 @@ class EnhancedARIMAForecaster:
         }
     
     def _determine_differencing(self, data: np.ndarray) -> int:
-        """Determine optimal differencing order"""
-        d = 0
-        current_data = data.copy()
+        """Determine optimal differencing order, reusing the result for an unchanged series"""
+        key = hashlib.blake2b(np.ascontiguousarray(data).tobytes(), digest_size=16).digest()
+        if key == self._differencing_key:
+            return self._differencing_order
+        
+        # Differences are written into two preallocated scratch buffers in turn
+        current_data = np.asarray(data, dtype=np.float64)
+        scratch = np.empty((2, len(current_data)))
         
-        while d <= 2:  # Maximum 2nd order differencing
+        for d in range(3):  # Maximum 2nd order differencing
             stationarity = self._check_stationarity(current_data)
             
             if stationarity['is_stationary']:
                 break
             
             # Apply differencing
-            current_data = np.diff(current_data)
-            d += 1
+            if d < 2:
+                out = scratch[d % 2, :len(current_data) - 1]
+                np.subtract(current_data[1:], current_data[:-1], out=out)
+                current_data = out
+        else:
+            d = 3
         
         logger.info(f"Determined differencing order: d={d}")
+        self._differencing_key = key
+        self._differencing_order = d
         return d
     
+    @staticmethod
+    def _default_model(n: int) -> ARIMAModel:
+        """Fallback order; series too short for a season get no seasonal part"""
+        if n >= _MIN_SEASONAL_LENGTH:
+            return ARIMAModel()
+        return ARIMAModel(P=0, D=0, Q=0, s=0)
+    
     def _find_optimal_parameters(self, data: np.ndarray) -> ARIMAModel:
-        """Find optimal ARIMA parameters using grid search"""
+        """Find optimal ARIMA parameters using a stepwise or exhaustive search"""
         if not self.auto_optimize:
-            return ARIMAModel()
+            return self._default_model(len(data))
         
-        best_aic = float('inf')
-        best_model = ARIMAModel()
-        
-        # Grid search for non-seasonal parameters
-        p_values = range(0, 4)
-        q_values = range(0, 4)
-        
-        # Seasonal parameters (if data length allows)
-        seasonal_periods = [12] if len(data) >= 50 else [1]
-        
-        for p in p_values:
-            for q in q_values:
-                for s in seasonal_periods:
-                    try:
-                        # Determine differencing
-                        d = self._determine_differencing(data)
-                        D = 1 if s > 1 else 0
-                        
-                        # Try different seasonal parameters
-                        for P in range(0, min(3, len(data) // s)):
-                            for Q in range(0, min(3, len(data) // s)):
-                                try:
-                                    model = ARIMA(data, order=(p, d, q), 
-                                                seasonal_order=(P, D, Q, s))
-                                    fitted_model = model.fit()
-                                    
-                                    if fitted_model.aic < best_aic:
-                                        best_aic = fitted_model.aic
-                                        best_model = ARIMAModel(p, d, q, P, D, Q, s)
-                                        
-                                except:
-                                    continue
-                                    
-                    except:
-                        continue
+        # Differencing order does not depend on the candidate, so determine it once
+        try:
+            d = self._determine_differencing(data)
+        except Exception as e:
+            logger.warning(f"Could not determine differencing order: {e}")
+            return self._default_model(len(data))
+        
+        # Seasonal parameters (if data length allows); s = 0 means no seasonal part
+        s = 12 if len(data) >= _MIN_SEASONAL_LENGTH else 0
+        D = 1 if s else 0
+        max_pq = 3
+        max_PQ = min(3, len(data) // s) - 1 if s else 0
+        
+        # Screening fits only rank candidates, so ship them single-precision data;
+        # the chosen order is refitted on the float64 series in _fit_model
+        screen_data = data.astype(np.float32)
+        if self.stepwise:
+            best = self._stepwise_search(screen_data, d, D, s, max_pq, max_PQ)
+        else:
+            best = self._grid_search(screen_data, d, D, s, max_pq, max_PQ)
         
+        best_model = ARIMAModel(best[0], d, best[1], best[2], D, best[3], s) if best else self._default_model(len(data))
         logger.info(f"Optimal parameters: {best_model}")
         return best_model
     
+    def _fit_candidates(self, data: np.ndarray, d: int, D: int, s: int,
+                        candidates: List[Tuple[int, int, int, int]]) -> Dict[Tuple[int, int, int, int], float]:
+        """Fit (p, q, P, Q) candidates in parallel and return their AICs, skipping failed fits"""
+        n = len(data)
+        orders = [((p, d, q), (P, D, Q, s)) for p, q, P, Q in candidates if _valid(p, q, P, D, Q, s, n)]
+        if not orders:
+            return {}
+        
+        # Each fit is independent; fan out one chunk per worker so the series
+        # is serialised once per worker rather than once per candidate
+        n_chunks = min(effective_n_jobs(self.n_jobs), len(orders))
+        chunks = [orders[i::n_chunks] for i in range(n_chunks)]
+        results = Parallel(n_jobs=n_chunks, backend='loky')(
+            delayed(_fit_chunk)(data, chunk) for chunk in chunks
+        )
+        return {
+            (order[0], order[2], seasonal_order[0], seasonal_order[2]): aic
+            for chunk_results in results
+            for aic, order, seasonal_order in filter(None, chunk_results)
+        }
+    
+    def _grid_search(self, data: np.ndarray, d: int, D: int, s: int,
+                     max_pq: int, max_PQ: int) -> Optional[Tuple[int, int, int, int]]:
+        """Fit (p, q, P, Q) combinations, most parsimonious first, stopping once
+        early_stop_patience candidates in a row fail to improve AIC by early_stop_delta"""
+        n = len(data)
+        candidates = sorted(
+            (
+                (p, q, P, Q)
+                for p in range(max_pq + 1)
+                for q in range(max_pq + 1)
+                for P in range(max_PQ + 1)
+                for Q in range(max_PQ + 1)
+                if _valid(p, q, P, D, Q, s, n)
+            ),
+            key=lambda c: (sum(c), c[0] * c[1]),
+        )
+        if not self.early_stop_patience:
+            aics = self._fit_candidates(data, d, D, s, candidates)
+            return min(aics, key=aics.get) if aics else None
+        
+        # Fit in chunks and check the stopping rule between them
+        chunk_size = max(self.early_stop_patience, effective_n_jobs(self.n_jobs))
+        best, best_aic, stale = None, float('inf'), 0
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            aics = self._fit_candidates(data, d, D, s, chunk)
+            for candidate in chunk:
+                aic = aics.get(candidate)
+                if aic is not None and aic < best_aic - self.early_stop_delta:
+                    best, best_aic, stale = candidate, aic, 0
+                else:
+                    stale += 1
+            if stale >= self.early_stop_patience:
+                logger.debug(f"Grid search stopped early after {start + len(chunk)} of {len(candidates)} candidates")
+                break
+        return best
+    
+    def _stepwise_search(self, data: np.ndarray, d: int, D: int, s: int,
+                         max_pq: int, max_PQ: int) -> Optional[Tuple[int, int, int, int]]:
+        """Hyndman-Khandakar stepwise search over (p, q, P, Q)"""
+        def in_bounds(c):
+            return 0 <= c[0] <= max_pq and 0 <= c[1] <= max_pq and 0 <= c[2] <= max_PQ and 0 <= c[3] <= max_PQ
+        
+        seasonal_seed = 1 if s > 1 else 0
+        frontier = {c for c in ((2, 2, seasonal_seed, seasonal_seed), (0, 0, 0, 0),
+                                (1, 0, seasonal_seed, 0), (0, 1, 0, seasonal_seed)) if in_bounds(c)}
+        visited = set()
+        best, best_aic = None, float('inf')
+        
+        while frontier:
+            visited |= frontier
+            aics = self._fit_candidates(data, d, D, s, sorted(frontier))
+            if not aics:
+                break
+            candidate = min(aics, key=aics.get)
+            if aics[candidate] >= best_aic - self.stepwise_tolerance:
+                break
+            best, best_aic = candidate, aics[candidate]
+            
+            # Move to the unvisited neighbours of the new best model
+            neighbours = (tuple(c + m for c, m in zip(best, move)) for move in _STEPWISE_MOVES)
+            frontier = {c for c in neighbours if in_bounds(c) and c not in visited}
+        
+        logger.debug(f"Stepwise search fitted {len(visited)} candidates")
+        return best
+    
+    def _select_model_config(self, data: np.ndarray) -> Tuple[ARIMAModel, bool]:
+        """Return the cached model order and whether it was just re-searched; the search
+        re-runs every search_interval fits or when residuals have degraded"""
+        searched = False
+        if (self._best_config is None or self._force_search
+                or self._fits_since_search >= self.search_interval):
+            self._best_config = self._find_optimal_parameters(data)
+            self._fits_since_search = 0
+            self._search_rmse = None
+            self._force_search = False
+            searched = True
+        self._fits_since_search += 1
+        return self._best_config, searched
+    
+    def _refresh_model(self, data: np.ndarray) -> Tuple[ARIMAModel, Dict[str, float]]:
+        """Refit by maximum likelihood after an order search; otherwise keep the
+        Kalman-updated model from add_data_point"""
+        model_config, searched = self._select_model_config(data)
+        
+        if (searched or self.fitted_model is None
+                or self.fitted_model.nobs > 2 * self.max_history_length):
+            self.fitted_model, self._diagnostics = self._fit_model(data, model_config)
+            diagnostics = self._diagnostics
+        else:
+            diagnostics = dict(self._diagnostics, aic=self.fitted_model.aic, bic=self.fitted_model.bic)
+        
+        self._track_residuals(self.fitted_model)
+        return model_config, diagnostics
+    
+    def _track_residuals(self, fitted_model) -> None:
+        """Schedule a new order search if residual RMSE regresses past residual_tolerance"""
+        resid = np.asarray(fitted_model.resid, dtype=np.float64)
+        rmse = float(np.sqrt(np.dot(resid, resid) / len(resid)))
+        if self._search_rmse is None:
+            self._search_rmse = rmse
+        elif rmse > self._search_rmse * self.residual_tolerance:
+            logger.info(f"Residual RMSE {rmse:.3f} degraded from {self._search_rmse:.3f}; re-searching orders")
+            self._force_search = True
+    
     def _fit_model(self, data: np.ndarray, model_config: ARIMAModel) -> ARIMA:
         """Fit ARIMA model with given parameters"""
         try:
             model = ARIMA(data, order=(model_config.p, model_config.d, model_config.q),
                          seasonal_order=(model_config.P, model_config.D, model_config.Q, model_config.s))
             
-            fitted_model = model.fit()
+            with threadpool_limits(limits=1, user_api='blas'):
+                fitted_model = model.fit(method_kwargs=dict(_FINAL_FIT_KWARGS))
             
             # Model diagnostics
             residuals = fitted_model.resid
@@ -200,28 +559,19 @@ class EnhancedARIMAForecaster:
             logger.error(f"Error fitting ARIMA model: {e}")
             raise
     
-    def _calculate_confidence_intervals(self, forecast_result, confidence_level: float) -> Tuple[np.ndarray, np.ndarray]:
-        """Calculate confidence intervals for forecast"""
-        # Get forecast standard errors
-        forecast_std = forecast_result.params.get('forecast_std', None)
-        
-        if forecast_std is None:
-            # Use historical residuals for confidence intervals
-            residuals = self.fitted_model.resid
-            residual_std = np.std(residuals)
-            
-            # Simple confidence intervals based on residual standard deviation
-            z_score = stats.norm.ppf((1 + confidence_level) / 2)
-            margin_of_error = z_score * residual_std
-            
-            lower_ci = forecast_result.forecast - margin_of_error
-            upper_ci = forecast_result.forecast + margin_of_error
+    def _calculate_confidence_intervals(self, prediction, confidence_level: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Calculate confidence intervals from a statsmodels PredictionResults"""
+        if confidence_level == self._confidence_level:
+            z_score = self._z_score
         else:
-            # Use model-provided confidence intervals
-            lower_ci = forecast_result.forecast - forecast_std
-            upper_ci = forecast_result.forecast + forecast_std
+            z_score = stats.norm.ppf((1 + confidence_level) / 2)
+        
+        # Same interval as prediction.conf_int(alpha=1 - confidence_level),
+        # using the cached z-score
+        mean = np.asarray(prediction.predicted_mean)
+        margin_of_error = z_score * np.asarray(prediction.se_mean)
         
-        return lower_ci, upper_ci
+        return mean - margin_of_error, mean + margin_of_error
     
     def _calculate_accuracy_metrics(self, actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
         """Calculate forecast accuracy metrics"""
@@ -230,56 +580,72 @@ class EnhancedARIMAForecaster:
             actual = actual[:min_len]
             predicted = predicted[:min_len]
         
-        # Mean Absolute Error
-        mae = np.mean(np.abs(actual - predicted))
+        actual = np.asarray(actual, dtype=np.float64)
+        predicted = np.asarray(predicted, dtype=np.float64)
         
-        # Mean Squared Error
-        mse = np.mean((actual - predicted) ** 2)
-        rmse = np.sqrt(mse)
+        # Shared intermediates, computed once
+        diff = actual - predicted
+        abs_diff = np.abs(diff)
+        sq = diff * diff
+        abs_actual = np.abs(actual)
         
-        # Mean Absolute Percentage Error
-        mape = np.mean(np.abs((actual - predicted) / actual)) * 100
+        # Mean Absolute Error / Mean Squared Error
+        mae = abs_diff.mean()
+        mse = sq.mean()
+        rmse = np.sqrt(mse)
         
         # Symmetric Mean Absolute Percentage Error
-        smape = 2 * np.mean(np.abs(actual - predicted) / (np.abs(actual) + np.abs(predicted))) * 100
+        denom = abs_actual + np.abs(predicted)
+        smape = 2 * np.divide(abs_diff, denom, out=np.zeros_like(abs_diff), where=denom != 0).mean() * 100
+        
+        # Mean Absolute Percentage Error over the non-zero actuals; zero actuals
+        # are undefined for MAPE, so they are counted and reported rather than
+        # averaged in as 0%. With no usable point, fall back to sMAPE.
+        nonzero = abs_actual != 0
+        mape_excluded = int(nonzero.size - np.count_nonzero(nonzero))
+        if mape_excluded == nonzero.size:
+            mape = smape
+        else:
+            mape = (abs_diff[nonzero] / abs_actual[nonzero]).mean() * 100
+        if mape_excluded:
+            logger.warning(f"MAPE excludes {mape_excluded} of {nonzero.size} points with zero actual value")
         
         # R-squared
-        ss_res = np.sum((actual - predicted) ** 2)
-        ss_tot = np.sum((actual - np.mean(actual)) ** 2)
-        r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
+        centered = actual - actual.mean()
+        ss_tot = np.dot(centered, centered)
+        r_squared = 1 - (sq.sum() / ss_tot) if ss_tot != 0 else 0
         
         return {
             'mae': mae,
             'mse': mse,
             'rmse': rmse,
             'mape': mape,
+            'mape_excluded': mape_excluded,
             'smape': smape,
             'r_squared': r_squared
         }
     
     def forecast(self, steps: Optional[int] = None) -> ForecastResult:
         """Generate forecast with confidence intervals"""
-        if len(self.history) < self.min_history_length:
+        if self._count < self.min_history_length:
             raise ValueError(f"Insufficient data for forecasting. Need at least {self.min_history_length} points")
         
         steps = steps or self.forecast_horizon
         data = self._prepare_data()
         
-        # Find optimal parameters
-        model_config = self._find_optimal_parameters(data)
+        # Find optimal parameters and fit (both reused between searches)
+        model_config, diagnostics = self._refresh_model(data)
         
-        # Fit model
-        self.fitted_model, diagnostics = self._fit_model(data, model_config)
-        
-        # Generate forecast
-        forecast_result = self.fitted_model.forecast(steps=steps)
+        # Generate forecast with its standard errors
+        prediction = self.fitted_model.get_forecast(steps=steps)
+        forecast_result = np.asarray(prediction.predicted_mean)
         
         # Calculate confidence intervals
-        lower_ci, upper_ci = self._calculate_confidence_intervals(forecast_result, self.confidence_level)
+        lower_ci, upper_ci = self._calculate_confidence_intervals(prediction, self.confidence_level)
         
         # Store forecast
         forecast_data = {
-            'timestamp': len(self.history),
+            'timestamp': self._count,
             'forecast': forecast_result,
             'lower_ci': lower_ci,
             'upper_ci': upper_ci,
@@ -290,7 +656,7 @@ class EnhancedARIMAForecaster:
         
         # Calculate accuracy metrics if we have recent actual data
         accuracy_metrics = {}
-        if len(self.history) >= steps:
+        if self._count >= steps:
             recent_actual = data[-steps:]
             accuracy_metrics = self._calculate_accuracy_metrics(recent_actual, forecast_result)
         
@@ -313,13 +679,12 @@ class EnhancedARIMAForecaster:
     
     def update_model(self):
         """Update model with new data"""
-        if len(self.history) < self.min_history_length:
+        if self._count < self.min_history_length:
             return
         
         # Retrain model with updated data
         data = self._prepare_data()
-        model_config = self._find_optimal_parameters(data)
-        self.fitted_model, _ = self._fit_model(data, model_config)
+        self._refresh_model(data)
         
         logger.info("Model updated with new data")
     
@@ -358,39 +723,48 @@ class EnhancedARIMAForecaster:
             logger.warning("No forecast history available for plotting")
             return
         
+        if self._fig is None:
+            # Imported lazily so the forecasting service never loads matplotlib
+            # unless a plot is actually requested; headless hosts render with Agg.
+            import matplotlib
+            if not os.environ.get('DISPLAY'):
+                matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+            self._fig, self._ax = plt.subplots(figsize=(12, 8))
+        else:
+            self._ax.clear()
+        fig, ax = self._fig, self._ax
+        
         latest_forecast = self.forecast_history[-1]
         data = self._prepare_data()
         
-        plt.figure(figsize=(12, 8))
-        
         # Plot historical data
-        plt.plot(range(len(data)), data, 'b-', label='Historical Data', linewidth=2)
+        ax.plot(range(len(data)), data, 'b-', label='Historical Data', linewidth=2)
         
         # Plot forecast
         forecast_start = len(data)
         forecast_end = forecast_start + len(latest_forecast['forecast'])
-        plt.plot(range(forecast_start, forecast_end), latest_forecast['forecast'], 
+        ax.plot(range(forecast_start, forecast_end), latest_forecast['forecast'], 
                 'r--', label='Forecast', linewidth=2)
         
         # Plot confidence intervals
-        plt.fill_between(range(forecast_start, forecast_end),
+        ax.fill_between(range(forecast_start, forecast_end),
                         latest_forecast['lower_ci'],
                         latest_forecast['upper_ci'],
                         alpha=0.3, color='red', label=f'{self.confidence_level*100:.0f}% Confidence Interval')
         
-        plt.title('ARIMA Forecast with Confidence Intervals')
-        plt.xlabel('Time')
-        plt.ylabel('Value')
-        plt.legend()
-        plt.grid(True, alpha=0.3)
+        ax.set_title('ARIMA Forecast with Confidence Intervals')
+        ax.set_xlabel('Time')
+        ax.set_ylabel('Value')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=150, bbox_inches='tight')
             logger.info(f"Forecast plot saved to {save_path}")
         else:
+            import matplotlib.pyplot as plt
             plt.show()
-        
-        plt.close()
     
     def get_scaling_recommendations(self, current_load: float, threshold: float = 0.8) -> Dict:
         """Get scaling recommendations based on forecast"""
@@ -403,7 +777,13 @@ class EnhancedARIMAForecaster:
         # Calculate forecast statistics
         max_forecast = np.max(forecast_values)
         mean_forecast = np.mean(forecast_values)
-        trend = np.polyfit(range(len(forecast_values)), forecast_values, 1)[0]
+        # Least-squares slope against 0..n-1 in closed form: sum((x - x_mean) * y) / sum((x - x_mean)^2)
+        n = len(forecast_values)
+        if n > 1:
+            x_centered = np.arange(n) - (n - 1) / 2.0
+            trend = float(np.dot(x_centered, forecast_values)) / (n * (n * n - 1) / 12.0)
+        else:
+            trend = 0.0
         
         # Determine scaling action
         if max_forecast > threshold:
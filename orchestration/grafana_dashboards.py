@@ -1,1127 +1,1174 @@
-import json
+import hashlib
+import logging
 import os
-from typing import Dict, List
+from typing import Dict, Final, List, Literal, Mapping, Optional, Sequence, Tuple
+from types import MappingProxyType
+from dataclasses import dataclass
 from pathlib import Path
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 
-class GrafanaDashboardGenerator:
-    """Generate Grafana dashboard configurations for VNF monitoring"""
-    
-    def __init__(self):
-        self.dashboards_dir = Path("grafana/dashboards")
-        self.dashboards_dir.mkdir(parents=True, exist_ok=True)
-        
-    def create_vnf_overview_dashboard(self) -> Dict:
-        """Create VNF Overview Dashboard"""
-        dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "VNF Overview Dashboard",
-                "tags": ["vnf", "overview", "performance"],
-                "style": "dark",
-                "timezone": "browser",
-                "panels": [
-                    # VNF Instance Count Panel
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    UJSON_AVAILABLE = False
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+    # ujson's C encoder is the fallback where orjson has no wheel (e.g. musl)
+    try:
+        import ujson
+        UJSON_AVAILABLE = True
+    except ImportError:
+        UJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+def _json_default(obj):
+    """Serialise the read-only mappings shared between panels"""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _thaw(obj):
+    """Plain dict/list copy of obj; ujson encodes read-only mappings as {}"""
+    if isinstance(obj, Mapping):
+        return {key: _thaw(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_thaw(value) for value in obj]
+    return obj
+
+def _compress(payload: bytes, level: int) -> Tuple[str, bytes]:
+    """Compress with zstd when zstandard is installed, otherwise gzip.
+
+    Returns the file extension to append (".zst" or ".gz") and the payload;
+    gzip output has a fixed mtime so unchanged input gives identical bytes.
+    """
+    if ZSTD_AVAILABLE:
+        return ".zst", zstandard.ZstdCompressor(level=level).compress(payload)
+    import gzip
+    return ".gz", gzip.compress(payload, compresslevel=min(level, 9), mtime=0)
+
+def _dumps_compact(obj) -> bytes:
+    """Serialise to compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default)
+    if UJSON_AVAILABLE:
+        return ujson.dumps(_thaw(obj), ensure_ascii=False,
+                           escape_forward_slashes=False).encode()
+    return json.dumps(obj, separators=(',', ':'), default=_json_default).encode()
+
+def _dumps(obj, indent: Optional[int] = None) -> bytes:
+    """Serialise to JSON bytes: compact by default, key-sorted when indented"""
+    if indent is None:
+        return _dumps_compact(obj)
+    if ORJSON_AVAILABLE and indent == 2:
+        return orjson.dumps(obj, default=_json_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    if UJSON_AVAILABLE:
+        return ujson.dumps(_thaw(obj), indent=indent, sort_keys=True, ensure_ascii=False,
+                           escape_forward_slashes=False).encode()
+    import json  # orjson only indents by two spaces
+    return json.dumps(obj, indent=indent, sort_keys=True, ensure_ascii=False,
+                      default=_json_default).encode()
+
+def _loads(blob: bytes):
+    """Parse JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(blob)
+    if UJSON_AVAILABLE:
+        return ujson.loads(blob)
+    return json.loads(blob)
+
+def _frozen(obj):
+    """Recursively convert dicts/lists into read-only mappings/tuples"""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _frozen(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_frozen(v) for v in obj)
+    return obj
+
+# fieldConfig subtrees repeated across panels, built once and shared by reference
+_PALETTE_CLASSIC = _frozen({"mode": "palette-classic"})
+_TS_CUSTOM = _frozen({"lineWidth": 2})
+_TS_CUSTOM_FILL10 = _frozen({"lineWidth": 2, "fillOpacity": 10})
+_STAT_LIST_FIELDCONFIG = _frozen({
+    "defaults": {"color": _PALETTE_CLASSIC, "custom": {"displayMode": "list"}}
+})
+_TABLE_FIELDCONFIG = _frozen({
+    "defaults": {"custom": {"align": "auto", "displayMode": "auto"}}
+})
+_STAT_THRESHOLDS_30 = _frozen({
+    "defaults": {
+        "unit": "percent",
+        "thresholds": {
+            "mode": "absolute",
+            "steps": [
+                {"color": "red", "value": None},
+                {"color": "orange", "value": 15},
+                {"color": "green", "value": 30}
+            ]
+        }
+    }
+})
+_TS_FIELDCONFIG_S = _frozen({
+    "defaults": {
+        "unit": "s",
+        "color": _PALETTE_CLASSIC,
+        "custom": _TS_CUSTOM
+    }
+})
+_TS_FIELDCONFIG_FILL20 = _frozen({
+    "defaults": {
+        "color": _PALETTE_CLASSIC,
+        "custom": {"lineWidth": 2, "fillOpacity": 20}
+    }
+})
+_PIE_FIELDCONFIG = _frozen({
+    "defaults": {"color": _PALETTE_CLASSIC, "custom": {"displayLabels": ["percent", "name"]}}
+})
+
+# Datasource every panel and target queries; the uid matches
+# grafana/provisioning/datasources/datasource.yml so Grafana doesn't resolve the
+# default datasource per query. GRAFANA_DATASOURCE_UID points at another one.
+PROMETHEUS_UID: Final = os.environ.get("GRAFANA_DATASOURCE_UID") or "prometheus"
+_DATASOURCE = _frozen({"type": "prometheus", "uid": PROMETHEUS_UID})
+
+# Dashboard-level settings shared by every dashboard; builders override as needed
+_DASHBOARD_BASE = MappingProxyType({
+    "id": None,
+    "datasource": _DATASOURCE,
+    "style": "dark",
+    "timezone": "browser",
+    "time": _frozen({"from": "now-1h", "to": "now"})
+})
+
+# (quantile, legend) pairs for the tail-latency panel; quantiles kept as text
+# so the PromQL reads exactly as written
+_TAIL_QUANTILES = (("0.50", "P50"), ("0.95", "P95"), ("0.99", "P99"), ("0.999", "P99.9"))
+
+# (latency histogram, legend) pairs for the component breakdown panel
+_LATENCY_COMPONENTS = (
+    ("vnf_processing_latency_seconds", "Processing"),
+    ("vnf_queuing_latency_seconds", "Queuing"),
+    ("sdn_network_latency_seconds", "Network")
+)
+
+# Recording rules (record -> expr) emitted alongside the dashboards; panels
+# query the pre-aggregated series instead of re-evaluating rate()/quantiles
+# on every refresh
+_RECORDING_RULES: Dict[str, str] = {}
+_RULES_INTERVAL: Final = "30s"
+
+def _recorded(record: str, expr: str) -> str:
+    """Register a recording rule and return the series name panels should query"""
+    _RECORDING_RULES[record] = expr
+    return record
+
+# Dashboard refresh intervals. Recorded series only change once per rules
+# evaluation, so refreshing faster than _RULES_INTERVAL just redraws identical
+# points; GRAFANA_REFRESH_OVERRIDE (e.g. "1m") applies one interval to all.
+_REFRESH_PROFILE: Final = {
+    "vnf_overview": "30s",
+    "latency_improvement": "30s",
+    "drl_agent": "30s",
+    "arima_forecasting": "1m",
+    "sfc_performance": "30s",
+    "alerting": "30s"
+}
+
+def _refresh_for(name: str) -> str:
+    """Refresh interval for a dashboard, honouring the operator override"""
+    return os.environ.get("GRAFANA_REFRESH_OVERRIDE") or _REFRESH_PROFILE[name]
+
+# PromQL expressions built from functions/operators; bare metric names stay inline
+_EXPR_VNF_CPU: Final = _recorded("vnf:cpu_usage_seconds:rate5m", "rate(vnf_cpu_usage_seconds_total[5m])")
+_EXPR_VNF_MEMORY_PCT: Final = "vnf_memory_usage_bytes / vnf_memory_limit_bytes * 100"
+_EXPR_VNF_NETWORK: Final = _recorded("vnf:network_bytes:rate5m", "rate(vnf_network_bytes_total[5m])")
+_EXPR_LATENCY_QUANTILE: Final = "histogram_quantile({q}, rate(sfc_current_latency_seconds_bucket[5m]))"
+_LATENCY_QUANTILE_SERIES: Final = {
+    q: _recorded(f"sfc:current_latency_seconds:p{q[2:]}_rate5m", _EXPR_LATENCY_QUANTILE.format(q=q))
+    for q, _ in _TAIL_QUANTILES
+}
+_EXPR_P95_LATENCY: Final = _LATENCY_QUANTILE_SERIES["0.95"]
+_EXPR_P99_LATENCY: Final = _LATENCY_QUANTILE_SERIES["0.99"]
+_EXPR_BASELINE_P95: Final = "vector(0.14)"
+_EXPR_P95_IMPROVEMENT: Final = f"((0.14 - {_EXPR_P95_LATENCY}) / 0.14) * 100"
+_EXPR_P99_IMPROVEMENT: Final = f"((0.32 - {_EXPR_P99_LATENCY}) / 0.32) * 100"
+_EXPR_SLA_THROUGHPUT: Final = _recorded(
+    "sfc:requests_processed_sla100ms:rate5m",
+    'rate(sfc_requests_processed_total{latency_bucket="le_0.1"}[5m])'
+)
+_EXPR_SLA_THROUGHPUT_GAIN: Final = f"(({_EXPR_SLA_THROUGHPUT} - 2100) / 2100) * 100"
+_EXPR_HISTOGRAM_MEAN: Final = "rate({metric}_sum[5m]) / rate({metric}_count[5m])"
+_LATENCY_COMPONENT_SERIES: Final = tuple(
+    (_recorded("{}:{}:mean5m".format(*metric.split("_", 1)), _EXPR_HISTOGRAM_MEAN.format(metric=metric)), legend)
+    for metric, legend in _LATENCY_COMPONENTS
+)
+_EXPR_DRL_ACTIONS: Final = "sum(drl_action_count) by (action_type)"
+_EXPR_SFC_PACKET_RATE: Final = _recorded("sfc:packets_processed:rate5m", "rate(sfc_packets_processed_total[5m])")
+_EXPR_ALERT_CHANGES: Final = "changes(alertmanager_alerts[1h])"
+_EXPR_ALERTS_BY_SEVERITY: Final = "count by (severity) (alerts)"
+
+# Points requested per series by time-based panels; panels that reduce each
+# series to one value only need the last point
+DEFAULT_MAX_POINTS: Final = 500
+_SINGLE_VALUE_PANELS: Final = frozenset({"stat", "gauge", "piechart", "table"})
+
+# Per-dashboard render budget; past this Grafana's browser-side query and
+# transformation work grows enough to stall page loads. Exceeding it logs a
+# warning, or raises when GRAFANA_DASHBOARD_AUDIT_STRICT is set (CI).
+MAX_PANELS: Final = 30
+MAX_TARGETS: Final = 60
+
+# Extra target fields implied by the panel type
+_TARGET_EXTRAS = {
+    "table": {"format": "table", "instant": True},
+    "heatmap": {"format": "heatmap"}
+}
+
+@dataclass(frozen=True, slots=True)
+class GridPos:
+    """Panel placement on Grafana's 24-column grid"""
+    h: int
+    w: int
+    x: int
+    y: int
+
+@dataclass(frozen=True, slots=True)
+class Panel:
+    """Immutable panel template; targets are (expr, legend) pairs and a legend
+    of None omits legendFormat (instant table queries)"""
+    id: int
+    title: str
+    type: str
+    targets: Sequence[Tuple[str, Optional[str]]]
+    fieldConfig: Mapping
+    gridPos: GridPos
+
+def _stat_panel(panel_id: int, title: str, targets: Sequence[Tuple[str, Optional[str]]],
+                grid_pos: GridPos, field_config: Mapping = _STAT_LIST_FIELDCONFIG) -> Panel:
+    """Stat panel template; several (expr, legend) targets share one panel"""
+    return Panel(panel_id, title, "stat", targets, field_config, grid_pos)
+
+def _ref_id(index: int) -> str:
+    """Grafana-style query letter for the index-th distinct expression: A..Z, AA, AB, ..."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+def _build_panels(panels: Sequence[Panel]) -> List[Dict]:
+    """Expand a dashboard's panel templates in reading order (top-to-bottom,
+    left-to-right) so the visible viewport's queries are issued first.
+
+    Each distinct expression gets one refId for the whole dashboard, so panels
+    repeating a query carry matching refIds.
+    """
+    ref_ids: Dict[str, str] = {}
+    return [_build_panel(panel, ref_ids)
+            for panel in sorted(panels, key=lambda p: (p.gridPos.y, p.gridPos.x))]
+
+def _build_panel(panel: Panel, ref_ids: Dict[str, str]) -> Dict:
+    """Expand a panel template into Grafana's panel dict"""
+    panel_type = panel.type
+    extras = _TARGET_EXTRAS.get(panel_type)
+    target_dicts = []
+    for expr, legend in panel.targets:
+        ref_id = ref_ids.get(expr)
+        if ref_id is None:
+            ref_id = ref_ids[expr] = _ref_id(len(ref_ids))
+        target = {"datasource": _DATASOURCE, "expr": expr, "refId": ref_id}
+        if legend is not None:
+            target["legendFormat"] = legend
+        if extras:
+            target.update(extras)
+        target_dicts.append(target)
+    grid = panel.gridPos
+    result = {
+        "id": panel.id,
+        "title": panel.title,
+        "type": panel_type,
+        "datasource": _DATASOURCE,
+        "targets": target_dicts,
+        "fieldConfig": panel.fieldConfig,
+        "gridPos": {"h": grid.h, "w": grid.w, "x": grid.x, "y": grid.y}
+    }
+    if panel_type in _SINGLE_VALUE_PANELS:
+        result["maxDataPoints"] = 1
+    else:
+        # Recorded series change once per rules evaluation; a finer step only
+        # returns duplicate points
+        result["maxDataPoints"] = DEFAULT_MAX_POINTS
+        result["interval"] = _RULES_INTERVAL
+    return result
+
+@lru_cache(maxsize=None)
+def _vnf_overview_dashboard() -> Dict:
+    """VNF Overview Dashboard definition, built once and shared"""
+    return {
+        "dashboard": {
+            **_DASHBOARD_BASE,
+            "title": "VNF Overview Dashboard",
+            "tags": ["vnf", "overview", "performance"],
+            "panels": _build_panels((
+                # VNF Instance Count Panel
+                _stat_panel(
+                    1, "VNF Instance Count",
+                    [("vnf_instances_total", "{{vnf_type}}")],
+                    GridPos(8, 6, 0, 0)
+                ),
+
+                # CPU Usage Panel
+                Panel(
+                    2, "CPU Usage by VNF", "timeseries",
+                    [(_EXPR_VNF_CPU, "{{vnf_type}} - {{instance}}")],
                     {
-                        "id": 1,
-                        "title": "VNF Instance Count",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "vnf_instances_total",
-                                "legendFormat": "{{vnf_type}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "displayMode": "list"
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
+                                "fillOpacity": 10,
+                                "showPoints": "never",
+                                "thresholds": {
+                                    "steps": [
+                                        {"color": "green", "value": None},
+                                        {"color": "red", "value": 80}
+                                    ]
                                 }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 6, "x": 0, "y": 0}
+                            },
+                            "unit": "percent"
+                        }
                     },
-                    
-                    # CPU Usage Panel
+                    GridPos(8, 12, 6, 0)
+                ),
+
+                # Memory Usage Panel
+                Panel(
+                    3, "Memory Usage by VNF", "timeseries",
+                    [(_EXPR_VNF_MEMORY_PCT, "{{vnf_type}} - {{instance}}")],
                     {
-                        "id": 2,
-                        "title": "CPU Usage by VNF",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(vnf_cpu_usage_seconds_total[5m])",
-                                "legendFormat": "{{vnf_type}} - {{instance}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "barAlignment": 0,
-                                    "lineWidth": 1,
-                                    "fillOpacity": 10,
-                                    "gradientMode": "none",
-                                    "spanNulls": False,
-                                    "showPoints": "never",
-                                    "pointSize": 5,
-                                    "stacking": {
-                                        "mode": "none",
-                                        "group": "A"
-                                    },
-                                    "axisLabel": "",
-                                    "scaleDistribution": {
-                                        "type": "linear"
-                                    },
-                                    "hideFrom": {
-                                        "legend": False,
-                                        "tooltip": False,
-                                        "vis": False
-                                    },
-                                    "thresholds": {
-                                        "steps": [
-                                            {"color": "green", "value": None},
-                                            {"color": "red", "value": 80}
-                                        ]
-                                    }
-                                },
-                                "unit": "percent"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 6, "y": 0}
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
+                                "fillOpacity": 10,
+                                "thresholds": {
+                                    "steps": [
+                                        {"color": "green", "value": None},
+                                        {"color": "yellow", "value": 70},
+                                        {"color": "red", "value": 90}
+                                    ]
+                                }
+                            },
+                            "unit": "percent"
+                        }
                     },
-                    
-                    # Memory Usage Panel
+                    GridPos(8, 12, 0, 8)
+                ),
+
+                # Network Throughput Panel
+                Panel(
+                    4, "Network Throughput", "timeseries",
+                    [(_EXPR_VNF_NETWORK, "{{vnf_type}} - {{instance}}")],
                     {
-                        "id": 3,
-                        "title": "Memory Usage by VNF",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "vnf_memory_usage_bytes / vnf_memory_limit_bytes * 100",
-                                "legendFormat": "{{vnf_type}} - {{instance}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 1,
-                                    "fillOpacity": 10,
-                                    "thresholds": {
-                                        "steps": [
-                                            {"color": "green", "value": None},
-                                            {"color": "yellow", "value": 70},
-                                            {"color": "red", "value": 90}
-                                        ]
-                                    }
-                                },
-                                "unit": "percent"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 8}
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
+                                "fillOpacity": 10
+                            },
+                            "unit": "Bps"
+                        }
                     },
-                    
-                    # Network Throughput Panel
+                    GridPos(8, 12, 12, 8)
+                ),
+
+                # VNF Health Status Panel
+                Panel(
+                    5, "VNF Health Status", "table",
+                    [("vnf_health_status", None)],
+                    _TABLE_FIELDCONFIG,
+                    GridPos(8, 24, 0, 16)
+                )
+            )),
+            "refresh": _refresh_for("vnf_overview")
+        }
+    }
+
+@lru_cache(maxsize=None)
+def _latency_improvement_dashboard() -> Dict:
+    """Latency Improvement Overview Dashboard definition, built once and shared"""
+    return {
+        "dashboard": {
+            **_DASHBOARD_BASE,
+            "uid": "latency-improvement",
+            "title": "Latency Improvement Overview",
+            "tags": ["latency", "improvement", "sfc"],
+            "panels": _build_panels((
+                # Panel 1: End-to-End Latency Trend (Current P95 vs Baseline)
+                Panel(
+                    1, "End-to-End Latency Trend", "timeseries",
+                    [
+                        (_EXPR_P95_LATENCY, "Current P95 Latency"),
+                        (_EXPR_BASELINE_P95, "Baseline P95 (140 ms)")
+                    ],
                     {
-                        "id": 4,
-                        "title": "Network Throughput",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(vnf_network_bytes_total[5m])",
-                                "legendFormat": "{{vnf_type}} - {{instance}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 1,
-                                    "fillOpacity": 10
-                                },
-                                "unit": "Bps"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 8}
+                        "defaults": {
+                            "unit": "s",
+                            "color": _PALETTE_CLASSIC,
+                            "custom": _TS_CUSTOM_FILL10
+                        }
                     },
-                    
-                    # VNF Health Status Panel
+                    GridPos(8, 24, 0, 0)
+                ),
+
+                # Panel 2: P95/P99 Improvement % (one stat panel, two targets)
+                _stat_panel(
+                    2, "Latency Improvement %",
+                    [
+                        (_EXPR_P95_IMPROVEMENT, "P95 Improvement"),
+                        (_EXPR_P99_IMPROVEMENT, "P99 Improvement")
+                    ],
+                    GridPos(6, 16, 0, 8),
+                    _STAT_THRESHOLDS_30
+                ),
+
+                # Panel 3: Tail Latency Distribution (P50/P95/P99/P99.9)
+                Panel(
+                    3, "Tail Latency Distribution", "timeseries",
+                    [(_LATENCY_QUANTILE_SERIES[q], legend) for q, legend in _TAIL_QUANTILES],
+                    _TS_FIELDCONFIG_S,
+                    GridPos(8, 24, 0, 14)
+                ),
+
+                # Panel 5: Throughput at 100 ms SLA Trend
+                Panel(
+                    5, "Throughput at 100 ms SLA", "timeseries",
+                    [(_EXPR_SLA_THROUGHPUT, "Throughput under 100 ms SLA")],
                     {
-                        "id": 5,
-                        "title": "VNF Health Status",
-                        "type": "table",
-                        "targets": [
-                            {
-                                "expr": "vnf_health_status",
-                                "format": "table",
-                                "instant": True
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "custom": {
-                                    "align": "auto",
-                                    "displayMode": "auto"
-                                }
+                        "defaults": {
+                            "unit": "req/s",
+                            "color": _PALETTE_CLASSIC,
+                            "custom": _TS_CUSTOM
+                        }
+                    },
+                    GridPos(8, 24, 0, 22)
+                ),
+
+                # Panel 6: Throughput Improvement % (Stat)
+                _stat_panel(
+                    6, "Throughput Improvement %",
+                    [(_EXPR_SLA_THROUGHPUT_GAIN, "Throughput Improvement")],
+                    GridPos(6, 8, 16, 8),
+                    {
+                        "defaults": {
+                            "unit": "percent",
+                            "thresholds": {
+                                "mode": "absolute",
+                                "steps": [
+                                    {"color": "red", "value": None},
+                                    {"color": "orange", "value": 0},
+                                    {"color": "green", "value": 15}
+                                ]
                             }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 16}
+                        }
                     }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "timepicker": {},
-                "templating": {
-                    "list": []
-                },
-                "annotations": {
-                    "list": []
-                },
-                "refresh": "5s"
-            }
+                ),
+
+                # Panel 7: Latency Component Breakdown
+                Panel(
+                    7, "Latency Component Breakdown", "timeseries",
+                    list(_LATENCY_COMPONENT_SERIES),
+                    _TS_FIELDCONFIG_S,
+                    GridPos(8, 24, 0, 30)
+                )
+            )),
+            "time": {"from": "now-6h", "to": "now"},
+            "refresh": _refresh_for("latency_improvement")
         }
-        
-        return dashboard
-    
-    def create_latency_improvement_dashboard(self) -> Dict:
-        """Create Latency Improvement Overview Dashboard"""
-        dashboard = {
-            "dashboard": {
-                "id": None,
-                "uid": "latency-improvement",
-                "title": "Latency Improvement Overview",
-                "tags": ["latency", "improvement", "sfc"],
-                "style": "dark",
-                "timezone": "browser",
-                "panels": [
-                    # Panel 1: End-to-End Latency Trend (Current P95 vs Baseline)
+    }
+
+@lru_cache(maxsize=None)
+def _drl_agent_dashboard() -> Dict:
+    """DRL Agent Dashboard definition, built once and shared"""
+    return {
+        "dashboard": {
+            **_DASHBOARD_BASE,
+            "title": "DRL Agent Dashboard",
+            "tags": ["drl", "agent", "learning"],
+            "panels": _build_panels((
+                # Training Loss Panel
+                Panel(
+                    1, "Training Loss", "timeseries",
+                    [("drl_training_loss", "Loss")],
+                    _TS_FIELDCONFIG_FILL20,
+                    GridPos(8, 12, 0, 0)
+                ),
+
+                # Episode Rewards Panel
+                Panel(
+                    2, "Episode Rewards", "timeseries",
+                    [("drl_episode_reward", "Reward")],
+                    _TS_FIELDCONFIG_FILL20,
+                    GridPos(8, 12, 12, 0)
+                ),
+
+                # Epsilon Decay Panel
+                Panel(
+                    3, "Epsilon Decay", "timeseries",
+                    [("drl_epsilon", "Epsilon")],
                     {
-                        "id": 1,
-                        "title": "End-to-End Latency Trend",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "histogram_quantile(0.95, rate(sfc_current_latency_seconds_bucket[5m]))",
-                                "legendFormat": "Current P95 Latency"
-                            },
-                            {
-                                "expr": "vector(0.14)",
-                                "legendFormat": "Baseline P95 (140 ms)"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "s",
-                                "color": {"mode": "palette-classic"},
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2,
-                                    "fillOpacity": 10
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 0}
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": _TS_CUSTOM,
+                            "min": 0,
+                            "max": 1
+                        }
                     },
-                    
-                    # Panel 2: Test Case 1 Improvement % (Stat)
+                    GridPos(8, 12, 0, 8)
+                ),
+
+                # Action Distribution Panel
+                Panel(
+                    4, "Action Distribution", "piechart",
+                    [(_EXPR_DRL_ACTIONS, "{{action_type}}")],
+                    _PIE_FIELDCONFIG,
+                    GridPos(8, 12, 12, 8)
+                ),
+
+                # SFC Satisfaction Rate Panel
+                Panel(
+                    5, "SFC Satisfaction Rate", "gauge",
+                    [("drl_sfc_satisfaction_rate", "Satisfaction Rate")],
                     {
-                        "id": 2,
-                        "title": "Test Case 1 Improvement %",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "((0.14 - histogram_quantile(0.95, rate(sfc_current_latency_seconds_bucket[5m]))) / 0.14) * 100",
-                                "legendFormat": "Improvement"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "percent",
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
                                 "thresholds": {
-                                    "mode": "absolute",
                                     "steps": [
                                         {"color": "red", "value": None},
-                                        {"color": "orange", "value": 15},
-                                        {"color": "green", "value": 30}
+                                        {"color": "yellow", "value": 0.7},
+                                        {"color": "green", "value": 0.9}
                                     ]
                                 }
-                            }
-                        },
-                        "gridPos": {"h": 6, "w": 8, "x": 0, "y": 8}
-                    },
-                    
-                    # Panel 3: Tail Latency Distribution (P50/P95/P99/P99.9)
-                    {
-                        "id": 3,
-                        "title": "Tail Latency Distribution",
-                        "type": "timeseries",
-                        "targets": [
-                            {"expr": "histogram_quantile(0.50, rate(sfc_current_latency_seconds_bucket[5m]))", "legendFormat": "P50"},
-                            {"expr": "histogram_quantile(0.95, rate(sfc_current_latency_seconds_bucket[5m]))", "legendFormat": "P95"},
-                            {"expr": "histogram_quantile(0.99, rate(sfc_current_latency_seconds_bucket[5m]))", "legendFormat": "P99"},
-                            {"expr": "histogram_quantile(0.999, rate(sfc_current_latency_seconds_bucket[5m]))", "legendFormat": "P99.9"}
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "s",
-                                "color": {"mode": "palette-classic"},
-                                "custom": {"drawStyle": "line", "lineWidth": 2}
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 14}
+                            },
+                            "min": 0,
+                            "max": 1,
+                            "unit": "percentunit"
+                        }
                     },
-                    
-                    # Panel 4: P99 Improvement % (Stat)
+                    GridPos(8, 8, 0, 16)
+                ),
+
+                # Resource Efficiency Panel
+                Panel(
+                    6, "Resource Efficiency", "gauge",
+                    [("drl_resource_efficiency", "Efficiency")],
                     {
-                        "id": 4,
-                        "title": "P99 Improvement %",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "((0.32 - histogram_quantile(0.99, rate(sfc_current_latency_seconds_bucket[5m]))) / 0.32) * 100",
-                                "legendFormat": "P99 Improvement"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "percent",
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
                                 "thresholds": {
-                                    "mode": "absolute",
                                     "steps": [
                                         {"color": "red", "value": None},
-                                        {"color": "orange", "value": 15},
-                                        {"color": "green", "value": 30}
+                                        {"color": "yellow", "value": 0.6},
+                                        {"color": "green", "value": 0.8}
                                     ]
                                 }
-                            }
-                        },
-                        "gridPos": {"h": 6, "w": 8, "x": 8, "y": 8}
+                            },
+                            "min": 0,
+                            "max": 1,
+                            "unit": "percentunit"
+                        }
                     },
-                    
-                    # Panel 5: Throughput at 100 ms SLA Trend
+                    GridPos(8, 8, 8, 16)
+                ),
+
+                # Agent Statistics Panel
+                _stat_panel(
+                    7, "Agent Statistics",
+                    [
+                        ("drl_training_steps", "Training Steps"),
+                        ("drl_replay_buffer_size", "Replay Buffer Size"),
+                        ("drl_episodes_completed", "Episodes Completed")
+                    ],
+                    GridPos(8, 8, 16, 16)
+                )
+            )),
+            "refresh": _refresh_for("drl_agent")
+        }
+    }
+
+@lru_cache(maxsize=None)
+def _arima_forecasting_dashboard() -> Dict:
+    """ARIMA Forecasting Dashboard definition, built once and shared"""
+    return {
+        "dashboard": {
+            **_DASHBOARD_BASE,
+            "title": "ARIMA Forecasting Dashboard",
+            "tags": ["arima", "forecasting", "prediction"],
+            "panels": _build_panels((
+                # Historical Data vs Forecast Panel
+                Panel(
+                    1, "Historical Data vs Forecast", "timeseries",
+                    [
+                        ("arima_historical_data", "Historical Data"),
+                        ("arima_forecast", "Forecast"),
+                        ("arima_forecast_upper_ci", "Upper CI"),
+                        ("arima_forecast_lower_ci", "Lower CI")
+                    ],
                     {
-                        "id": 5,
-                        "title": "Throughput at 100 ms SLA",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(sfc_requests_processed_total{latency_bucket=\"le_0.1\"}[5m])",
-                                "legendFormat": "Throughput under 100 ms SLA"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "req/s",
-                                "color": {"mode": "palette-classic"},
-                                "custom": {"drawStyle": "line", "lineWidth": 2}
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 22}
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": _TS_CUSTOM_FILL10
+                        }
                     },
-                    
-                    # Panel 6: Throughput Improvement % (Stat)
+                    GridPos(8, 24, 0, 0)
+                ),
+
+                # Forecast Accuracy Metrics Panel
+                _stat_panel(
+                    2, "Forecast Accuracy Metrics",
+                    [
+                        ("arima_mae", "MAE"),
+                        ("arima_rmse", "RMSE"),
+                        ("arima_mape", "MAPE"),
+                        ("arima_r_squared", "R²")
+                    ],
+                    GridPos(8, 12, 0, 8)
+                ),
+
+                # Model Quality Metrics Panel
+                _stat_panel(
+                    3, "Model Quality Metrics",
+                    [
+                        ("arima_aic", "AIC"),
+                        ("arima_bic", "BIC"),
+                        ("arima_ljung_box_pvalue", "Ljung-Box p-value")
+                    ],
+                    GridPos(8, 12, 12, 8)
+                ),
+
+                # Scaling Recommendations Panel
+                Panel(
+                    4, "Scaling Recommendations", "table",
+                    [("arima_scaling_recommendation", None)],
+                    _TABLE_FIELDCONFIG,
+                    GridPos(8, 24, 0, 16)
+                )
+            )),
+            "refresh": _refresh_for("arima_forecasting")
+        }
+    }
+
+@lru_cache(maxsize=None)
+def _sfc_performance_dashboard() -> Dict:
+    """SFC Performance Dashboard definition, built once and shared"""
+    return {
+        "dashboard": {
+            **_DASHBOARD_BASE,
+            "title": "SFC Performance Dashboard",
+            "tags": ["sfc", "performance", "latency"],
+            "panels": _build_panels((
+                # End-to-End Latency Panel
+                Panel(
+                    1, "End-to-End Latency", "timeseries",
+                    [("sfc_e2e_latency_seconds", "{{chain_id}}")],
                     {
-                        "id": 6,
-                        "title": "Throughput Improvement %",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "((rate(sfc_requests_processed_total{latency_bucket=\"le_0.1\"}[5m]) - 2100) / 2100) * 100",
-                                "legendFormat": "Throughput Improvement"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "percent",
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
+                                "lineWidth": 2,
                                 "thresholds": {
-                                    "mode": "absolute",
                                     "steps": [
-                                        {"color": "red", "value": None},
-                                        {"color": "orange", "value": 0},
-                                        {"color": "green", "value": 15}
+                                        {"color": "green", "value": None},
+                                        {"color": "yellow", "value": 0.5},
+                                        {"color": "red", "value": 1.0}
                                     ]
                                 }
-                            }
-                        },
-                        "gridPos": {"h": 6, "w": 8, "x": 16, "y": 8}
-                    },
-                    
-                    # Panel 7: Latency Component Breakdown
-                    {
-                        "id": 7,
-                        "title": "Latency Component Breakdown",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(vnf_processing_latency_seconds_sum[5m]) / rate(vnf_processing_latency_seconds_count[5m])",
-                                "legendFormat": "Processing"
                             },
-                            {
-                                "expr": "rate(vnf_queuing_latency_seconds_sum[5m]) / rate(vnf_queuing_latency_seconds_count[5m])",
-                                "legendFormat": "Queuing"
-                            },
-                            {
-                                "expr": "rate(sdn_network_latency_seconds_sum[5m]) / rate(sdn_network_latency_seconds_count[5m])",
-                                "legendFormat": "Network"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "unit": "s",
-                                "color": {"mode": "palette-classic"},
-                                "custom": {"drawStyle": "line", "lineWidth": 2}
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 30}
-                    }
-                ],
-                "time": {"from": "now-6h", "to": "now"},
-                "timepicker": {},
-                "templating": {"list": []},
-                "annotations": {"list": []},
-                "refresh": "10s"
-            }
-        }
-        
-        return dashboard
-    
-    def create_drl_agent_dashboard(self) -> Dict:
-        """Create DRL Agent Dashboard"""
-        dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "DRL Agent Dashboard",
-                "tags": ["drl", "agent", "learning"],
-                "style": "dark",
-                "timezone": "browser",
-                "panels": [
-                    # Training Loss Panel
-                    {
-                        "id": 1,
-                        "title": "Training Loss",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "drl_training_loss",
-                                "legendFormat": "Loss"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2,
-                                    "fillOpacity": 20
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 0}
+                            "unit": "s"
+                        }
                     },
-                    
-                    # Episode Rewards Panel
+                    GridPos(8, 12, 0, 0)
+                ),
+
+                # SFC Throughput Panel
+                Panel(
+                    2, "SFC Throughput", "timeseries",
+                    [(_EXPR_SFC_PACKET_RATE, "{{chain_id}}")],
                     {
-                        "id": 2,
-                        "title": "Episode Rewards",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "drl_episode_reward",
-                                "legendFormat": "Reward"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2,
-                                    "fillOpacity": 20
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 0}
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": _TS_CUSTOM,
+                            "unit": "packets/sec"
+                        }
                     },
-                    
-                    # Epsilon Decay Panel
+                    GridPos(8, 12, 12, 0)
+                ),
+
+                # VNF Chain Status Panel
+                Panel(
+                    3, "VNF Chain Status", "table",
+                    [("sfc_chain_status", None)],
+                    _TABLE_FIELDCONFIG,
+                    GridPos(8, 12, 0, 8)
+                ),
+
+                # SLA Violations Panel
+                Panel(
+                    4, "SLA Violations", "timeseries",
+                    [("sfc_sla_violations_total", "{{chain_id}}")],
                     {
-                        "id": 3,
-                        "title": "Epsilon Decay",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "drl_epsilon",
-                                "legendFormat": "Epsilon"
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
+                                "drawStyle": "bars"
                             }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2
-                                },
-                                "min": 0,
-                                "max": 1
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 8}
+                        }
                     },
-                    
-                    # Action Distribution Panel
+                    GridPos(8, 12, 12, 8)
+                ),
+
+                # Resource Utilization by Chain Panel
+                Panel(
+                    5, "Resource Utilization by Chain", "heatmap",
+                    [("sfc_resource_utilization", "{{chain_id}} - {{resource_type}}")],
                     {
-                        "id": 4,
-                        "title": "Action Distribution",
-                        "type": "piechart",
-                        "targets": [
-                            {
-                                "expr": "sum(drl_action_count) by (action_type)",
-                                "legendFormat": "{{action_type}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "displayLabels": ["percent", "name"]
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": {
+                                "thresholds": {
+                                    "steps": [
+                                        {"color": "green", "value": None},
+                                        {"color": "yellow", "value": 0.7},
+                                        {"color": "red", "value": 0.9}
+                                    ]
                                 }
                             }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 8}
+                        }
                     },
-                    
-                    # SFC Satisfaction Rate Panel
-                    {
-                        "id": 5,
-                        "title": "SFC Satisfaction Rate",
-                        "type": "gauge",
-                        "targets": [
-                            {
-                                "expr": "drl_sfc_satisfaction_rate",
-                                "legendFormat": "Satisfaction Rate"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "thresholds": {
-                                        "steps": [
-                                            {"color": "red", "value": None},
-                                            {"color": "yellow", "value": 0.7},
-                                            {"color": "green", "value": 0.9}
-                                        ]
-                                    }
-                                },
-                                "min": 0,
-                                "max": 1,
-                                "unit": "percentunit"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 8, "x": 0, "y": 16}
-                    },
-                    
-                    # Resource Efficiency Panel
+                    GridPos(8, 24, 0, 16)
+                )
+            )),
+            "refresh": _refresh_for("sfc_performance")
+        }
+    }
+
+@lru_cache(maxsize=None)
+def _alerting_dashboard() -> Dict:
+    """Alerting Dashboard definition, built once and shared"""
+    return {
+        "dashboard": {
+            **_DASHBOARD_BASE,
+            "title": "Alerting Dashboard",
+            "tags": ["alerts", "notifications", "incidents"],
+            "panels": _build_panels((
+                # Active Alerts Panel
+                Panel(
+                    1, "Active Alerts", "table",
+                    [("alerts", None)],
+                    _TABLE_FIELDCONFIG,
+                    GridPos(8, 24, 0, 0)
+                ),
+
+                # Alert History Panel
+                Panel(
+                    2, "Alert History", "timeseries",
+                    [(_EXPR_ALERT_CHANGES, "{{alertname}}")],
                     {
-                        "id": 6,
-                        "title": "Resource Efficiency",
-                        "type": "gauge",
-                        "targets": [
-                            {
-                                "expr": "drl_resource_efficiency",
-                                "legendFormat": "Efficiency"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "thresholds": {
-                                        "steps": [
-                                            {"color": "red", "value": None},
-                                            {"color": "yellow", "value": 0.6},
-                                            {"color": "green", "value": 0.8}
-                                        ]
-                                    }
-                                },
-                                "min": 0,
-                                "max": 1,
-                                "unit": "percentunit"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 8, "x": 8, "y": 16}
+                        "defaults": {
+                            "color": _PALETTE_CLASSIC,
+                            "custom": _TS_CUSTOM
+                        }
                     },
-                    
-                    # Agent Statistics Panel
-                    {
-                        "id": 7,
-                        "title": "Agent Statistics",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "drl_training_steps",
-                                "legendFormat": "Training Steps"
-                            },
-                            {
-                                "expr": "drl_replay_buffer_size",
-                                "legendFormat": "Replay Buffer Size"
-                            },
-                            {
-                                "expr": "drl_episodes_completed",
-                                "legendFormat": "Episodes Completed"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "displayMode": "list"
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 8, "x": 16, "y": 16}
-                    }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "timepicker": {},
-                "templating": {
-                    "list": []
-                },
-                "annotations": {
-                    "list": []
-                },
-                "refresh": "5s"
-            }
+                    GridPos(8, 12, 0, 8)
+                ),
+
+                # Alert Severity Distribution Panel
+                Panel(
+                    3, "Alert Severity Distribution", "piechart",
+                    [(_EXPR_ALERTS_BY_SEVERITY, "{{severity}}")],
+                    _PIE_FIELDCONFIG,
+                    GridPos(8, 12, 12, 8)
+                )
+            )),
+            "refresh": _refresh_for("alerting")
         }
+    }
+
+_DASHBOARD_BUILDERS = {
+    "vnf_overview": _vnf_overview_dashboard,
+    "latency_improvement": _latency_improvement_dashboard,
+    "drl_agent": _drl_agent_dashboard,
+    "arima_forecasting": _arima_forecasting_dashboard,
+    "sfc_performance": _sfc_performance_dashboard,
+    "alerting": _alerting_dashboard,
+}
+
+@lru_cache(maxsize=None)
+def _dashboard_blob(name: str) -> bytes:
+    """Compact JSON encoding of a dashboard definition, encoded once"""
+    return _dumps_compact(_DASHBOARD_BUILDERS[name]())
+
+@lru_cache(maxsize=None)
+def _dashboard_pretty_blob(name: str) -> bytes:
+    """Indented, key-sorted provisioning JSON for a dashboard, encoded once"""
+    return _dumps(_DASHBOARD_BUILDERS[name](), indent=2)
+
+_DASHBOARD_DESCRIPTIONS = MappingProxyType({
+    "vnf_overview": "Comprehensive overview of VNF instances, resource usage, and health status",
+    "drl_agent": "Deep Reinforcement Learning agent training metrics and performance indicators",
+    "arima_forecasting": "ARIMA forecasting results, accuracy metrics, and scaling recommendations",
+    "sfc_performance": "Service Function Chain performance metrics including latency and throughput",
+    "alerting": "Active alerts, alert history, and severity distribution",
+    "latency_improvement": "Real-time latency improvement tracking across test cases with component breakdown"
+})
+_DEFAULT_DESCRIPTION: Final = "Dashboard for monitoring and visualization"
+
+@lru_cache(maxsize=None)
+def _dashboard_index_blob(names: Tuple[str, ...]) -> bytes:
+    """Indented index JSON for a set of dashboards, encoded once per name tuple"""
+    index = {
+        "dashboards": [
+            {
+                "name": name.replace("_", " ").title(),
+                "file": f"{name}_dashboard.json",
+                "description": _DASHBOARD_DESCRIPTIONS.get(name, _DEFAULT_DESCRIPTION)
+            }
+            for name in names
+        ]
+    }
+    return _dumps(index, indent=2)
+
+class GrafanaDashboardGenerator:
+    """Generate Grafana dashboard configurations for VNF monitoring.
+    
+    Every panel adds query and initialisation load in the browser, so related
+    single-value stats share one multi-target stat panel and each dashboard
+    stays well under ~30 panels.
+    """
+    
+    __slots__ = ('dashboards_dir', '_hash_cache')
+    
+    # Directories already created in this process
+    _ensured = set()
+    
+    def __init__(self):
+        self.dashboards_dir = Path("grafana/dashboards")
+        self._hash_cache: Dict[Path, bytes] = {}
+        target = self.dashboards_dir.absolute()
+        if target not in self._ensured:
+            self.dashboards_dir.mkdir(parents=True, exist_ok=True)
+            self._ensured.add(target)
+    
+    def _dashboard(self, name: str) -> Dict:
+        """Fresh dict for a dashboard, decoded from its once-per-process JSON.
         
-        return dashboard
+        Callers own the result, so editing it never leaks into later calls.
+        """
+        return _loads(_dashboard_blob(name))
+        
+    @property
+    def vnf_overview_dashboard(self) -> Dict:
+        """VNF Overview Dashboard, as a fresh dict"""
+        return self._dashboard("vnf_overview")
+    
+    def create_vnf_overview_dashboard(self) -> Dict:
+        """Create VNF Overview Dashboard"""
+        return self.vnf_overview_dashboard
+    
+    @property
+    def latency_improvement_dashboard(self) -> Dict:
+        """Latency Improvement Overview Dashboard, as a fresh dict"""
+        return self._dashboard("latency_improvement")
+    
+    def create_latency_improvement_dashboard(self) -> Dict:
+        """Create Latency Improvement Overview Dashboard"""
+        return self.latency_improvement_dashboard
+    
+    @property
+    def drl_agent_dashboard(self) -> Dict:
+        """DRL Agent Dashboard, as a fresh dict"""
+        return self._dashboard("drl_agent")
+    
+    def create_drl_agent_dashboard(self) -> Dict:
+        """Create DRL Agent Dashboard"""
+        return self.drl_agent_dashboard
+    
+    @property
+    def arima_forecasting_dashboard(self) -> Dict:
+        """ARIMA Forecasting Dashboard, as a fresh dict"""
+        return self._dashboard("arima_forecasting")
     
     def create_arima_forecasting_dashboard(self) -> Dict:
         """Create ARIMA Forecasting Dashboard"""
-        dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "ARIMA Forecasting Dashboard",
-                "tags": ["arima", "forecasting", "prediction"],
-                "style": "dark",
-                "timezone": "browser",
-                "panels": [
-                    # Historical Data vs Forecast Panel
-                    {
-                        "id": 1,
-                        "title": "Historical Data vs Forecast",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "arima_historical_data",
-                                "legendFormat": "Historical Data"
-                            },
-                            {
-                                "expr": "arima_forecast",
-                                "legendFormat": "Forecast"
-                            },
-                            {
-                                "expr": "arima_forecast_upper_ci",
-                                "legendFormat": "Upper CI"
-                            },
-                            {
-                                "expr": "arima_forecast_lower_ci",
-                                "legendFormat": "Lower CI"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2,
-                                    "fillOpacity": 10
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 0}
-                    },
-                    
-                    # Forecast Accuracy Metrics Panel
-                    {
-                        "id": 2,
-                        "title": "Forecast Accuracy Metrics",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "arima_mae",
-                                "legendFormat": "MAE"
-                            },
-                            {
-                                "expr": "arima_rmse",
-                                "legendFormat": "RMSE"
-                            },
-                            {
-                                "expr": "arima_mape",
-                                "legendFormat": "MAPE"
-                            },
-                            {
-                                "expr": "arima_r_squared",
-                                "legendFormat": "R²"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "displayMode": "list"
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 8}
-                    },
-                    
-                    # Model Quality Metrics Panel
-                    {
-                        "id": 3,
-                        "title": "Model Quality Metrics",
-                        "type": "stat",
-                        "targets": [
-                            {
-                                "expr": "arima_aic",
-                                "legendFormat": "AIC"
-                            },
-                            {
-                                "expr": "arima_bic",
-                                "legendFormat": "BIC"
-                            },
-                            {
-                                "expr": "arima_ljung_box_pvalue",
-                                "legendFormat": "Ljung-Box p-value"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "displayMode": "list"
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 8}
-                    },
-                    
-                    # Scaling Recommendations Panel
-                    {
-                        "id": 4,
-                        "title": "Scaling Recommendations",
-                        "type": "table",
-                        "targets": [
-                            {
-                                "expr": "arima_scaling_recommendation",
-                                "format": "table",
-                                "instant": True
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "custom": {
-                                    "align": "auto",
-                                    "displayMode": "auto"
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 16}
-                    }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "timepicker": {},
-                "templating": {
-                    "list": []
-                },
-                "annotations": {
-                    "list": []
-                },
-                "refresh": "10s"
-            }
-        }
-        
-        return dashboard
+        return self.arima_forecasting_dashboard
+    
+    @property
+    def sfc_performance_dashboard(self) -> Dict:
+        """SFC Performance Dashboard, as a fresh dict"""
+        return self._dashboard("sfc_performance")
     
     def create_sfc_performance_dashboard(self) -> Dict:
         """Create SFC Performance Dashboard"""
-        dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "SFC Performance Dashboard",
-                "tags": ["sfc", "performance", "latency"],
-                "style": "dark",
-                "timezone": "browser",
-                "panels": [
-                    # End-to-End Latency Panel
-                    {
-                        "id": 1,
-                        "title": "End-to-End Latency",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "sfc_e2e_latency_seconds",
-                                "legendFormat": "{{chain_id}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2,
-                                    "thresholds": {
-                                        "steps": [
-                                            {"color": "green", "value": None},
-                                            {"color": "yellow", "value": 0.5},
-                                            {"color": "red", "value": 1.0}
-                                        ]
-                                    }
-                                },
-                                "unit": "s"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 0}
-                    },
-                    
-                    # SFC Throughput Panel
-                    {
-                        "id": 2,
-                        "title": "SFC Throughput",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "rate(sfc_packets_processed_total[5m])",
-                                "legendFormat": "{{chain_id}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2
-                                },
-                                "unit": "packets/sec"
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 0}
-                    },
-                    
-                    # VNF Chain Status Panel
-                    {
-                        "id": 3,
-                        "title": "VNF Chain Status",
-                        "type": "table",
-                        "targets": [
-                            {
-                                "expr": "sfc_chain_status",
-                                "format": "table",
-                                "instant": True
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "custom": {
-                                    "align": "auto",
-                                    "displayMode": "auto"
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 8}
-                    },
-                    
-                    # SLA Violations Panel
-                    {
-                        "id": 4,
-                        "title": "SLA Violations",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "sfc_sla_violations_total",
-                                "legendFormat": "{{chain_id}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "bars",
-                                    "lineWidth": 1
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 8}
-                    },
-                    
-                    # Resource Utilization by Chain Panel
-                    {
-                        "id": 5,
-                        "title": "Resource Utilization by Chain",
-                        "type": "heatmap",
-                        "targets": [
-                            {
-                                "expr": "sfc_resource_utilization",
-                                "format": "heatmap",
-                                "legendFormat": "{{chain_id}} - {{resource_type}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "thresholds": {
-                                        "steps": [
-                                            {"color": "green", "value": None},
-                                            {"color": "yellow", "value": 0.7},
-                                            {"color": "red", "value": 0.9}
-                                        ]
-                                    }
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 16}
-                    }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "timepicker": {},
-                "templating": {
-                    "list": []
-                },
-                "annotations": {
-                    "list": []
-                },
-                "refresh": "5s"
-            }
-        }
-        
-        return dashboard
+        return self.sfc_performance_dashboard
+    
+    @property
+    def alerting_dashboard(self) -> Dict:
+        """Alerting Dashboard, as a fresh dict"""
+        return self._dashboard("alerting")
     
     def create_alerting_dashboard(self) -> Dict:
         """Create Alerting Dashboard"""
-        dashboard = {
-            "dashboard": {
-                "id": None,
-                "title": "Alerting Dashboard",
-                "tags": ["alerts", "notifications", "incidents"],
-                "style": "dark",
-                "timezone": "browser",
-                "panels": [
-                    # Active Alerts Panel
-                    {
-                        "id": 1,
-                        "title": "Active Alerts",
-                        "type": "table",
-                        "targets": [
-                            {
-                                "expr": "alerts",
-                                "format": "table",
-                                "instant": True
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "custom": {
-                                    "align": "auto",
-                                    "displayMode": "auto"
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 24, "x": 0, "y": 0}
-                    },
-                    
-                    # Alert History Panel
-                    {
-                        "id": 2,
-                        "title": "Alert History",
-                        "type": "timeseries",
-                        "targets": [
-                            {
-                                "expr": "changes(alertmanager_alerts[1h])",
-                                "legendFormat": "{{alertname}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "drawStyle": "line",
-                                    "lineInterpolation": "linear",
-                                    "lineWidth": 2
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 0, "y": 8}
-                    },
-                    
-                    # Alert Severity Distribution Panel
-                    {
-                        "id": 3,
-                        "title": "Alert Severity Distribution",
-                        "type": "piechart",
-                        "targets": [
-                            {
-                                "expr": "count by (severity) (alerts)",
-                                "legendFormat": "{{severity}}"
-                            }
-                        ],
-                        "fieldConfig": {
-                            "defaults": {
-                                "color": {
-                                    "mode": "palette-classic"
-                                },
-                                "custom": {
-                                    "displayLabels": ["percent", "name"]
-                                }
-                            }
-                        },
-                        "gridPos": {"h": 8, "w": 12, "x": 12, "y": 8}
-                    }
-                ],
-                "time": {
-                    "from": "now-1h",
-                    "to": "now"
-                },
-                "timepicker": {},
-                "templating": {
-                    "list": []
-                },
-                "annotations": {
-                    "list": []
-                },
-                "refresh": "10s"
-            }
-        }
+        return self.alerting_dashboard
+    
+    def create_dashboard_bytes(self, name: str, indent: Optional[int] = None) -> bytes:
+        """JSON for a dashboard, serialised once per process.
         
-        return dashboard
+        Compact by default; indent=2 gives the provisioning file format.
+        Callers that only write or send the dashboard can skip the dict entirely.
+        """
+        if name not in _DASHBOARD_BUILDERS:
+            raise KeyError(f"Unknown dashboard: {name}")
+        if indent is None:
+            return _dashboard_blob(name)
+        if indent == 2:
+            return _dashboard_pretty_blob(name)
+        return _dumps(_DASHBOARD_BUILDERS[name](), indent=indent)
     
-    def generate_all_dashboards(self):
-        """Generate all dashboard configurations"""
-        dashboards = {
-            "vnf_overview": self.create_vnf_overview_dashboard(),
-            "drl_agent": self.create_drl_agent_dashboard(),
-            "arima_forecasting": self.create_arima_forecasting_dashboard(),
-            "sfc_performance": self.create_sfc_performance_dashboard(),
-            "alerting": self.create_alerting_dashboard(),
-            "latency_improvement": self.create_latency_improvement_dashboard()
-        }
+    def render_dashboard(self, name: str, **overrides) -> Dict:
+        """Fresh copy of a dashboard with dashboard-level fields replaced.
         
-        # Save each dashboard to file
+        e.g. render_dashboard("alerting", title="Tenant A Alerts", uid="tenant-a-alerts")
+        """
+        if name not in _DASHBOARD_BUILDERS:
+            raise KeyError(f"Unknown dashboard: {name}")
+        dashboard = _loads(_dashboard_blob(name))
+        dashboard["dashboard"].update(overrides)
+        return dashboard
+    
+    def create_all(self) -> Dict[str, Dict]:
+        """Build every dashboard, keyed by name"""
+        factories = [
+            ("vnf_overview", self.create_vnf_overview_dashboard),
+            ("drl_agent", self.create_drl_agent_dashboard),
+            ("arima_forecasting", self.create_arima_forecasting_dashboard),
+            ("sfc_performance", self.create_sfc_performance_dashboard),
+            ("alerting", self.create_alerting_dashboard),
+            ("latency_improvement", self.create_latency_improvement_dashboard)
+        ]
+        # Decoding is pure Python under the GIL; a thread pool would only add overhead
+        dashboards = {name: factory() for name, factory in factories}
         for name, dashboard in dashboards.items():
-            filepath = self.dashboards_dir / f"{name}_dashboard.json"
-            with open(filepath, 'w') as f:
-                json.dump(dashboard, f, indent=2)
-            print(f"Generated {name} dashboard: {filepath}")
+            self._audit(name, dashboard)
+        return dashboards
+    
+    def _audit(self, name: str, dashboard: Dict):
+        """Flag a dashboard whose panel or target count exceeds the render budget"""
+        panels = dashboard["dashboard"]["panels"]
+        targets = sum(len(panel.get("targets", ())) for panel in panels)
+        if len(panels) <= MAX_PANELS and targets <= MAX_TARGETS:
+            return
+        message = (f"Dashboard {name} has {len(panels)} panels / {targets} targets "
+                   f"(budget {MAX_PANELS} / {MAX_TARGETS}), consider splitting it")
+        if os.environ.get("GRAFANA_DASHBOARD_AUDIT_STRICT"):
+            raise ValueError(message)
+        logger.warning(message)
+    
+    def generate_all_dashboards(self, format: Literal["json", "msgpack"] = "json",
+                                compress: bool = False):
+        """Generate all dashboard configurations.
+        
+        format="msgpack" writes <name>_dashboard.msgpack files for non-Grafana
+        consumers (CI diffing, validators) instead of the provisioning JSON.
+        compress=True also writes a <name>_dashboard.json.zst sidecar (.gz
+        without zstandard) per JSON file for ConfigMap/rsync sync scripts;
+        Grafana's provisioner only reads the plain *.json files.
+        """
+        # The directory may have been removed since __init__; one mkdir per run
+        self.dashboards_dir.mkdir(parents=True, exist_ok=True)
+        dashboards = self.create_all()
+        
+        if format == "msgpack":
+            import msgpack  # optional; only needed for this output format
+            for name, dashboard in dashboards.items():
+                filepath = self.dashboards_dir / f"{name}_dashboard.msgpack"
+                self.if_changed_write(filepath, msgpack.packb(dashboard, use_bin_type=True))
+                logger.info("Generated %s dashboard: %s", name, filepath)
+            return dashboards
+        if format != "json":
+            raise ValueError(f"Unsupported dashboard format: {format}")
+        
+        # Save each dashboard to file straight from its cached provisioning
+        # encoding rather than re-encoding the dicts
+        with ThreadPoolExecutor(max_workers=len(dashboards)) as executor:
+            paths = list(executor.map(self.write_dashboard, dashboards, repeat(None), repeat(2)))
+        for name, filepath in zip(dashboards, paths):
+            logger.info("Generated %s dashboard: %s", name, filepath)
+            if compress:
+                # Level 3: whitespace and repeated keys compress well even at
+                # the fast end of zstd
+                ext, blob = _compress(self.create_dashboard_bytes(name, 2), 3)
+                sidecar = filepath.with_name(filepath.name + ext)
+                self.if_changed_write(sidecar, blob)
+                logger.info("Generated %s dashboard sidecar: %s", name, sidecar)
         
         # Create dashboard index
         self.create_dashboard_index(dashboards)
         
+        # Recording rules backing the panel queries
+        self.write_recording_rules()
+        
         return dashboards
     
+    def if_changed_write(self, path: Path, payload: bytes) -> bool:
+        """Atomically write payload unless the file already holds identical bytes.
+        
+        Returns True when the file was (re)written. Skipping unchanged output
+        avoids waking Grafana's provisioning watcher for no-op refreshes.
+        """
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if path.exists():
+            known = self._hash_cache.get(path)
+            if known is None:
+                # First write to this path: compare against what is on disk
+                known = hashlib.blake2b(path.read_bytes(), digest_size=16).digest()
+                self._hash_cache[path] = known
+            if known == digest:
+                return False
+        # Per-process temp name so concurrent generators never share one; the
+        # .tmp suffix keeps Grafana's *.json provisioning scan away from it
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._hash_cache[path] = digest
+        return True
+    
+    def write_dashboard(self, name: str, dashboard: Optional[Dict] = None,
+                        indent: Optional[int] = None) -> Path:
+        """Serialise a dashboard and write it with a single write call.
+        
+        Output is compact unless an indent is given. Without a dashboard the
+        cached encoding of the named built-in dashboard is written as-is.
+        """
+        filepath = self.dashboards_dir / f"{name}_dashboard.json"
+        if dashboard is None:
+            payload = self.create_dashboard_bytes(name, indent)
+        else:
+            payload = _dumps(dashboard, indent)
+        self.if_changed_write(filepath, payload)
+        return filepath
+    
+    def _write_one(self, item: Tuple[str, Dict], indent: Optional[int]) -> Path:
+        """Encode and write one (name, dashboard) pair; thread-pool worker"""
+        name, dashboard = item
+        return self.write_dashboard(name, dashboard, indent)
+    
+    def write_all(self, dashboards: Optional[Dict[str, Dict]] = None,
+                  indent: Optional[int] = None, bundle: bool = True) -> List[Path]:
+        """Write every dashboard to its own file, overlapping the writes on a thread pool.
+        
+        With bundle=True all dashboards are also written as a single compact
+        JSON object next to the provisioning directory, so consumers that can
+        take one payload (e.g. a ConfigMap) need only one read.
+        """
+        if dashboards is None:
+            dashboards = self.create_all()
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(dashboards)))) as executor:
+            paths = list(executor.map(self._write_one, dashboards.items(), repeat(indent)))
+        if bundle:
+            bundle_file = self.dashboards_dir.parent / "dashboards_bundle.json"
+            self.if_changed_write(bundle_file, _dumps_compact(dashboards))
+            paths.append(bundle_file)
+        return paths
+    
+    def dump_ndjson(self, path: Optional[Path] = None) -> Path:
+        """Write all dashboards as JSON Lines, one compact dashboard per line.
+        
+        Lines are joined from the cached serialised blobs, so the whole file
+        goes out in a single contiguous write.
+        """
+        if path is None:
+            path = self.dashboards_dir.parent / "dashboards.ndjson"
+        path = Path(path)
+        self.if_changed_write(path, b"".join(
+            _dashboard_blob(name) + b"\n" for name in _DASHBOARD_BUILDERS))
+        return path
+    
+    def dump_compressed(self, path: Optional[Path] = None) -> Path:
+        """Write all dashboards as one compressed compact-JSON bundle.
+        
+        Uses zstd (level 19) when zstandard is installed, otherwise gzip, and
+        keeps the bundle well under the 1 MB ConfigMap limit.
+        """
+        ext, payload = _compress(_dumps_compact(self.create_all()), 19)
+        if path is None:
+            path = self.dashboards_dir.parent / f"dashboards_bundle.json{ext}"
+        path = Path(path)
+        self.if_changed_write(path, payload)
+        return path
+    
     def create_dashboard_index(self, dashboards: Dict):
         """Create an index file listing all dashboards"""
-        index = {
-            "dashboards": [
-                {
-                    "name": name.replace("_", " ").title(),
-                    "file": f"{name}_dashboard.json",
-                    "description": self.get_dashboard_description(name)
-                }
-                for name in dashboards.keys()
-            ]
-        }
-        
         index_file = self.dashboards_dir / "dashboard_index.json"
-        with open(index_file, 'w') as f:
-            json.dump(index, f, indent=2)
+        self.if_changed_write(index_file, _dashboard_index_blob(tuple(dashboards)))
+        
+        logger.info("Generated dashboard index: %s", index_file)
+    
+    def write_recording_rules(self, path: Optional[Path] = None) -> Path:
+        """Write the Prometheus recording rules the dashboard panels query.
         
-        print(f"Generated dashboard index: {index_file}")
+        Defaults to recording_rules.yml next to prometheus_config.yml, which
+        lists it under rule_files.
+        """
+        if path is None:
+            path = self.dashboards_dir.parent.parent / "recording_rules.yml"
+        path = Path(path)
+        lines = [
+            "# Generated by grafana_dashboards.py; edit the _recorded() calls there instead.",
+            "groups:",
+            "  - name: vnf_dashboard_rules",
+            f"    interval: {_RULES_INTERVAL}",
+            "    rules:"
+        ]
+        for record, expr in _RECORDING_RULES.items():
+            # JSON string literals are valid double-quoted YAML scalars
+            lines.append(f"      - record: {record}")
+            lines.append(f"        expr: {_dumps_compact(expr).decode()}")
+        self.if_changed_write(path, ("\n".join(lines) + "\n").encode())
+        logger.info("Generated recording rules: %s", path)
+        return path
     
     def get_dashboard_description(self, name: str) -> str:
         """Get description for dashboard"""
-        descriptions = {
-            "vnf_overview": "Comprehensive overview of VNF instances, resource usage, and health status",
-            "drl_agent": "Deep Reinforcement Learning agent training metrics and performance indicators",
-            "arima_forecasting": "ARIMA forecasting results, accuracy metrics, and scaling recommendations",
-            "sfc_performance": "Service Function Chain performance metrics including latency and throughput",
-            "alerting": "Active alerts, alert history, and severity distribution",
-            "latency_improvement": "Real-time latency improvement tracking across test cases with component breakdown"
-        }
-        return descriptions.get(name, "Dashboard for monitoring and visualization")
+        return _DASHBOARD_DESCRIPTIONS.get(name, _DEFAULT_DESCRIPTION)
 
 def main():
     """Generate all Grafana dashboards"""
+    # Handlers are configured here only, so importing the module stays silent
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     generator = GrafanaDashboardGenerator()
     dashboards = generator.generate_all_dashboards()
     
-    print(f"\nGenerated {len(dashboards)} dashboards:")
+    logger.info("\nGenerated %d dashboards:", len(dashboards))
     for name in dashboards.keys():
-        print(f"  - {name.replace('_', ' ').title()}")
+        logger.info("  - %s", name.replace('_', ' ').title())
     
-    print(f"\nDashboard files saved to: {generator.dashboards_dir}")
-    print("Import these JSON files into Grafana to set up the monitoring dashboards.")
+    logger.info("\nDashboard files saved to: %s", generator.dashboards_dir)
+    logger.info("Import these JSON files into Grafana to set up the monitoring dashboards.")
 
 if __name__ == "__main__":
     main()
@@ -10,9 +10,12 @@ import asyncio
 import logging
 import signal
 import json
+import time
 from typing import Dict, List, Optional, Any
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
 # Add the project root to Python path for imports
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
@@ -30,7 +33,7 @@ try:
     from orchestration.vnf_orchestrator import VNFOrchestrator
     from orchestration.sdn_controller import SDNController
     from orchestration.sfc_orchestrator import SFCOrchestrator
-    from orchestration.drl_agent import DRLAgent, SFCState, SFCAction, ActionType
+    from orchestration.drl_agent import DRLAgent, SFCAction, ActionType, StepResult
     from orchestration.enhanced_arima import EnhancedARIMAForecaster
     from orchestration.grafana_dashboards import GrafanaDashboardGenerator
     from orchestration.metrics_registry import MetricsRegistry, get_vnf_orchestrator_metrics, start_metrics_server
@@ -41,6 +44,40 @@ except ImportError as e:
     logger.error("Try: python -m orchestration.integrated_system")
     sys.exit(1)
 
+# uvloop's libuv-based event loop cuts per-wakeup scheduling cost for the
+# many short-sleeping background loops; plain asyncio is used without it
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# VNF types the DRL state, scaling and removal decisions consider
+VNF_TYPES = ('firewall', 'spamfilter', 'contentfilter', 'encryption')
+
+# Help text for the nfv_<key> gauges exported from IntegratedNFVSystem.metrics
+SYSTEM_METRIC_DESCRIPTIONS = {
+    'sfc_requests': 'SFC requests received',
+    'sfc_satisfied': 'SFC requests satisfied',
+    'sfc_dropped': 'SFC requests dropped',
+    'resource_efficiency': 'Mean CPU/memory utilisation of the DC',
+    'average_latency': 'Average SFC latency in ms (simulated)',
+    'drl_episodes': 'DRL training steps with a non-zero loss',
+    'forecast_accuracy': 'R-squared of the latest ARIMA forecast'
+}
+
+def _compute_load(total_cpu: float, total_memory: float,
+                  cpu_available: float, memory_available: float) -> float:
+    """Mean of CPU and memory utilisation"""
+    return 0.5 * ((total_cpu - cpu_available) / total_cpu
+                  + (total_memory - memory_available) / total_memory)
+
 class IntegratedNFVSystem:
     """Complete integrated NFV system with DRL and forecasting"""
     
@@ -66,6 +103,33 @@ class IntegratedNFVSystem:
             'forecast_accuracy': 0.0
         }
         
+        # Prometheus gauges mirroring self.metrics, set each monitoring tick
+        registry = MetricsRegistry()
+        self._metric_gauges = {
+            key: registry.get_or_create_gauge(f'nfv_{key}', description)
+            for key, description in SYSTEM_METRIC_DESCRIPTIONS.items()
+        }
+        
+        # Rolling window of recent DRL rewards/losses for progress logging
+        self._drl_window = 100
+        self._drl_rewards = np.zeros(self._drl_window, dtype=np.float32)
+        self._drl_losses = np.zeros(self._drl_window, dtype=np.float32)
+        self._drl_step = 0
+        self._step_result = StepResult()  # reused by _execute_drl_action
+        # WAIT has no handler: it leaves the reset result untouched
+        self._action_dispatch = {
+            ActionType.ALLOCATE: self._do_allocate,
+            ActionType.UNINSTALL: self._do_uninstall
+        }
+        # Pending request figures fed to the DRL state; the bandwidth and
+        # latency constraints are simulated constants
+        self._pending_requests = {'request_count': 0, 'bandwidth_requirements': 50.0,
+                                  'latency_constraints': 500.0}
+        # DRL state slots grouped by SFCState field, from the agent's schema
+        self._state_slots: Dict[str, List[tuple]] = {}
+        # Experiences are buffered and trained on in bursts of this many steps
+        self.drl_train_every = self.config.get('drl_train_every', 8)
+        
         # Configuration
         self.drl_enabled = self.config.get('drl_enabled', True)
         self.forecasting_enabled = self.config.get('forecasting_enabled', True)
@@ -74,6 +138,18 @@ class IntegratedNFVSystem:
         
         # Threading
         self.executor = ThreadPoolExecutor(max_workers=4)
+        self._tasks: List[asyncio.Task] = []  # background loops started by start()
+        
+        # Cache of orchestrator resources (see _resources); the periodic loops
+        # share a snapshot younger than resources_max_age seconds
+        self._resources_cache = None
+        self._resources_dirty = True
+        self._resources_ts = 0.0
+        self.resources_max_age = self.config.get('resources_max_age', 1.0)
+        
+        # Append-only JSONL log of monitoring snapshots (see _append_metrics_record)
+        self.metrics_log_path = self.config.get('metrics_log_path', 'system_metrics.jsonl')
+        self._metrics_log = None
         
     async def initialize(self):
         """Initialize all system components"""
@@ -103,6 +179,7 @@ class IntegratedNFVSystem:
                     'target_update_freq': 100
                 }
                 self.drl_agent = DRLAgent(drl_config)
+                self._state_slots = self._build_state_slots(self.drl_agent.state_schema)
                 logger.info("DRL Agent initialized")
             
             # Initialize ARIMA Forecaster
@@ -133,85 +210,150 @@ class IntegratedNFVSystem:
         logger.info("Starting Integrated NFV System...")
         self.running = True
         
-        # Start background tasks
-        tasks = []
+        # Route run_in_executor(None, ...) and asyncio.to_thread through the
+        # bounded pool instead of letting the loop create its own
+        asyncio.get_running_loop().set_default_executor(self.executor)
+        
+        # Background loops
+        loops = []
         
         if self.drl_enabled:
-            tasks.append(asyncio.create_task(self._drl_learning_loop()))
+            loops.append(self._drl_learning_loop())
         
         if self.forecasting_enabled:
-            tasks.append(asyncio.create_task(self._forecasting_loop()))
+            loops.append(self._forecasting_loop())
         
         if self.auto_scaling_enabled:
-            tasks.append(asyncio.create_task(self._auto_scaling_loop()))
-        
-        tasks.append(asyncio.create_task(self._monitoring_loop()))
-        tasks.append(asyncio.create_task(self._sfc_request_simulation()))
-        
-        # Wait for shutdown signal
-        await self.shutdown_event.wait()
-        
-        # Cancel all tasks
-        for task in tasks:
-            task.cancel()
-        
-        await asyncio.gather(*tasks, return_exceptions=True)
+            loops.append(self._auto_scaling_loop())
+        
+        loops.append(self._monitoring_loop())
+        loops.append(self._sfc_request_simulation())
+        
+        if sys.version_info >= (3, 11):
+            # A loop dying with an unexpected error cancels the others and
+            # surfaces from start() instead of going unnoticed
+            async with asyncio.TaskGroup() as group:
+                self._tasks = [group.create_task(coro) for coro in loops]
+                await self.shutdown_event.wait()
+                for task in self._tasks:
+                    task.cancel()
+        else:
+            self._tasks = [asyncio.create_task(coro) for coro in loops]
+            
+            # Wait for shutdown signal
+            await self.shutdown_event.wait()
+            
+            # Cancel all tasks
+            for task in self._tasks:
+                task.cancel()
+            
+            await asyncio.gather(*self._tasks, return_exceptions=True)
         logger.info("System shutdown completed")
     
+    async def _sleep_until(self, deadline: float) -> float:
+        """Sleep until deadline on the loop clock and return the next base time.
+        
+        Loops add their period to the returned value, so intervals are kept
+        without drift; a loop that overran its deadline resynchronises to now
+        instead of running back-to-back catch-up iterations.
+        """
+        loop = asyncio.get_running_loop()
+        delay = deadline - loop.time()
+        if delay <= 0:
+            return loop.time()
+        await asyncio.sleep(delay)
+        return deadline
+    
     async def _drl_learning_loop(self):
         """DRL agent learning loop"""
         logger.info("Starting DRL learning loop")
+        loop = asyncio.get_running_loop()
+        
+        # The state observed after one step is the starting state of the
+        # next, so it is only rebuilt from scratch at start-up or after an error.
+        state_vec = None
+        pending = []  # experiences since the last training burst
+        burst = self.drl_train_every
+        next_at = loop.time()  # each loop paces itself against its own deadline
         
         while self.running and not self.shutdown_event.is_set():
             try:
-                # Get current system state
-                state = self._get_system_state()
+                if state_vec is None:
+                    self._resources_dirty = True
+                    state_vec = self._get_system_state()
                 
-                # Select action using DRL agent
-                action = self.drl_agent.select_action(state, training=True)
+                # Select action using DRL agent; torch work runs on the
+                # bounded executor so the other loops keep being scheduled
+                action = await loop.run_in_executor(self.executor, self.drl_agent.select_action,
+                                                    state_vec, True)
                 
                 # Execute action
                 result = await self._execute_drl_action(action)
                 
                 # Calculate reward
-                reward = self.drl_agent.calculate_reward(action, state, result)
+                reward = self.drl_agent.calculate_reward(action, state_vec, result)
                 
-                # Get next state
-                next_state = self._get_system_state()
+                # Get next state from a fresh resource snapshot
+                self._resources_dirty = True
+                next_vec = self._get_system_state()
                 
                 # Store experience
                 done = False  # Continuous learning
-                self.drl_agent.replay_buffer.add((state, action, reward, next_state, done))
+                pending.append((state_vec, self.drl_agent.action_index(action), reward, next_vec, done))
+                state_vec = next_vec
                 
-                # Train agent
-                loss = self.drl_agent.train_step()
-                if loss > 0:
-                    self.metrics['drl_episodes'] += 1
+                # Record step reward in the rolling window
+                self._drl_rewards[self._drl_step % self._drl_window] = reward
+                self._drl_step += 1
                 
-                # Log progress
-                if self.metrics['drl_episodes'] % 100 == 0:
-                    logger.info(f"DRL Training - Episodes: {self.metrics['drl_episodes']}, "
-                              f"Loss: {loss:.4f}, Epsilon: {self.drl_agent.epsilon:.3f}")
+                if len(pending) >= burst:
+                    # Train on the buffered steps in one executor round trip;
+                    # acting still happens once per second
+                    steps = len(pending)
+                    self.drl_agent.replay_buffer.add_batch(pending)
+                    pending.clear()
+                    losses = await loop.run_in_executor(self.executor, self.drl_agent.train_steps,
+                                                        steps)
+                    first = self._drl_step - steps
+                    for offset, loss in enumerate(losses):
+                        self._drl_losses[(first + offset) % self._drl_window] = loss
+                        if loss > 0:
+                            self.metrics['drl_episodes'] += 1
+                    
+                    # Log progress once per window
+                    if first // self._drl_window != self._drl_step // self._drl_window \
+                            and logger.isEnabledFor(logging.INFO):
+                        logger.info("DRL Training - Steps: %d, Episodes: %d, Avg Reward: %.3f, "
+                                    "Avg Loss: %.4f, Epsilon: %.3f",
+                                    self._drl_step, self.metrics['drl_episodes'],
+                                    self._drl_rewards.mean(), self._drl_losses.mean(),
+                                    self.drl_agent.epsilon)
                 
-                await asyncio.sleep(1)  # Training interval
+                next_at = await self._sleep_until(next_at + 1)  # Training interval
                 
             except Exception as e:
                 logger.error(f"Error in DRL learning loop: {e}")
-                await asyncio.sleep(5)
+                state_vec = None
+                next_at = await self._sleep_until(loop.time() + 5)
     
     async def _forecasting_loop(self):
         """ARIMA forecasting loop"""
         logger.info("Starting ARIMA forecasting loop")
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
         
         while self.running and not self.shutdown_event.is_set():
             try:
                 # Collect current metrics
-                current_load = self._get_current_load()
-                self.arima_forecaster.add_data_point(current_load)
+                current_load = self._get_current_load(self._resources(self.resources_max_age))
+                # Appending runs the fitted model's Kalman filter; keep it off the loop
+                await loop.run_in_executor(self.executor, self.arima_forecaster.add_data_point,
+                                           current_load)
                 
                 # Generate forecast if enough data
-                if len(self.arima_forecaster.history) >= self.arima_forecaster.min_history_length:
-                    forecast_result = self.arima_forecaster.forecast(steps=6)
+                if self.arima_forecaster.history_length >= self.arima_forecaster.min_history_length:
+                    forecast_result = await loop.run_in_executor(
+                        self.executor, self.arima_forecaster.forecast, 6)
                     
                     # Get scaling recommendations
                     recommendations = self.arima_forecaster.get_scaling_recommendations(
@@ -226,21 +368,24 @@ class IntegratedNFVSystem:
                     if forecast_result.accuracy_metrics:
                         self.metrics['forecast_accuracy'] = forecast_result.accuracy_metrics.get('r_squared', 0.0)
                 
-                await asyncio.sleep(30)  # Forecast interval
+                next_at = await self._sleep_until(next_at + 30)  # Forecast interval
                 
             except Exception as e:
                 logger.error(f"Error in forecasting loop: {e}")
-                await asyncio.sleep(60)
+                next_at = await self._sleep_until(loop.time() + 60)
     
     async def _auto_scaling_loop(self):
         """Auto-scaling loop based on forecasts and DRL decisions"""
         logger.info("Starting auto-scaling loop")
         
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        
         while self.running and not self.shutdown_event.is_set():
             try:
                 # Get current resource utilization
-                resources = self.orchestrator.get_available_resources()
-                current_load = self._get_current_load()
+                resources = self._resources(self.resources_max_age)
+                current_load = self._get_current_load(resources)
                 
                 # Check if scaling is needed
                 scaling_action = await self._determine_scaling_action(current_load, resources)
@@ -248,121 +393,128 @@ class IntegratedNFVSystem:
                 if scaling_action:
                     await self._execute_scaling_action(scaling_action)
                 
-                await asyncio.sleep(60)  # Scaling check interval
+                next_at = await self._sleep_until(next_at + 60)  # Scaling check interval
                 
             except Exception as e:
                 logger.error(f"Error in auto-scaling loop: {e}")
-                await asyncio.sleep(120)
+                next_at = await self._sleep_until(loop.time() + 120)
     
     async def _monitoring_loop(self):
         """System monitoring loop"""
         logger.info("Starting monitoring loop")
         
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        
         while self.running and not self.shutdown_event.is_set():
             try:
                 # Update system metrics
                 self._update_system_metrics()
+                self._append_metrics_record()
                 
                 # Log system status
-                logger.info(f"System Status - SFC Requests: {self.metrics['sfc_requests']}, "
-                          f"Satisfied: {self.metrics['sfc_satisfied']}, "
-                          f"Efficiency: {self.metrics['resource_efficiency']:.3f}")
+                logger.info("System Status - SFC Requests: %d, Satisfied: %d, Efficiency: %.3f",
+                            self.metrics['sfc_requests'], self.metrics['sfc_satisfied'],
+                            self.metrics['resource_efficiency'])
                 
-                await asyncio.sleep(10)  # Monitoring interval
+                next_at = await self._sleep_until(next_at + 10)  # Monitoring interval
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
-                await asyncio.sleep(30)
+                next_at = await self._sleep_until(loop.time() + 30)
     
     async def _sfc_request_simulation(self):
         """Simulate SFC requests for testing"""
         logger.info("Starting SFC request simulation")
         
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        
         while self.running and not self.shutdown_event.is_set():
             try:
                 # Simulate SFC request
                 await self._simulate_sfc_request()
                 
-                await asyncio.sleep(30)  # Request interval
+                next_at = await self._sleep_until(next_at + 30)  # Request interval
                 
             except Exception as e:
                 logger.error(f"Error in SFC request simulation: {e}")
-                await asyncio.sleep(60)
+                next_at = await self._sleep_until(loop.time() + 60)
     
-    def _get_system_state(self) -> SFCState:
-        """Get current system state for DRL agent"""
-        # Get DC resources
-        dc_resources = self.orchestrator.get_available_resources()
-        
-        # Get installed VNFs
-        installed_vnfs = {}
-        vnf_types = ['firewall', 'spamfilter', 'contentfilter', 'encryption']
-        for vnf_type in vnf_types:
-            instances = self.orchestrator.get_vnf_instances(vnf_type)
-            installed_vnfs[vnf_type] = len(instances)
-        
-        # Get SFC allocations
-        sfc_allocations = self.orchestrator.get_active_sfcs()
-        
-        # Get pending requests (simulated)
-        pending_requests = {
-            'request_count': self.metrics['sfc_requests'],
-            'bandwidth_requirements': 50.0,  # Simulated
-            'latency_constraints': 500.0  # Simulated
-        }
-        
-        # Get current load
-        current_load = {}
-        for vnf_type in vnf_types:
-            load = self.orchestrator.get_vnf_load(vnf_type)
-            current_load[vnf_type] = load
-        
-        return SFCState(
-            dc_resources=dc_resources,
-            installed_vnfs=installed_vnfs,
-            sfc_allocations=sfc_allocations,
-            pending_requests=pending_requests,
-            current_load=current_load
-        )
+    @staticmethod
+    def _build_state_slots(schema: Dict[str, int]) -> Dict[str, List[tuple]]:
+        """Group a DRL state schema into (slot, key) pairs per SFCState field"""
+        slots = {'dc_resources': [], 'installed_vnfs': [], 'sfc_allocations': [],
+                 'pending_requests': [], 'current_load': []}
+        for name, slot in schema.items():
+            field, _, key = name.partition('.')
+            slots[field].append((slot, key))
+        return slots
     
-    async def _execute_drl_action(self, action: SFCAction) -> Dict:
-        """Execute DRL action and return result"""
-        result = {
-            'sfc_satisfied': False,
-            'sfc_dropped': False,
-            'action_invalid': False,
-            'unnecessary': False,
-            'resource_efficiency': 0.0,
-            'sla_violation': False
-        }
+    def _get_system_state(self) -> np.ndarray:
+        """Get current system state for DRL agent, encoded per its state schema.
+        
+        Writes straight into a fresh observation vector; no SFCState is built.
+        """
+        # Resources, instances, loads and SFC allocations in one orchestrator call
+        snapshot = self.orchestrator.get_state_snapshot(VNF_TYPES, self._resources())
+        self._pending_requests['request_count'] = self.metrics['sfc_requests']
+        
+        slots = self._state_slots
+        vec = np.zeros(self.drl_agent.state_dim, dtype=np.float32)
+        for slot, key in slots['dc_resources']:
+            vec[slot] = snapshot.resources.get(key, 0.0)
+        for slot, key in slots['installed_vnfs']:
+            vec[slot] = len(snapshot.instances.get(key, ()))
+        for slot, _ in slots['sfc_allocations']:
+            vec[slot] = len(snapshot.active_sfcs)
+        for slot, key in slots['pending_requests']:
+            vec[slot] = self._pending_requests.get(key, 0.0)
+        for slot, key in slots['current_load']:
+            vec[slot] = snapshot.loads.get(key, 0.0)
+        return vec
+    
+    async def _execute_drl_action(self, action: SFCAction) -> StepResult:
+        """Execute DRL action and return result (valid until the next call)"""
+        result = self._step_result
+        result.reset()
+        
+        handler = self._action_dispatch.get(action.action_type)
+        if handler is None:
+            return result
         
         try:
-            if action.action_type == ActionType.ALLOCATE:
-                success = await self.orchestrator.allocate_vnf(action.vnf_type)
-                if success:
-                    result['sfc_satisfied'] = True
-                    result['resource_efficiency'] = self._calculate_resource_efficiency()
-                else:
-                    result['action_invalid'] = True
-                    
-            elif action.action_type == ActionType.UNINSTALL:
-                instances = self.orchestrator.get_vnf_instances(action.vnf_type)
-                if instances:
-                    load = self.orchestrator.get_vnf_load(action.vnf_type)
-                    if load < 0.3:
-                        await self.orchestrator.remove_vnf(action.vnf_type, instances[0])
-                        result['resource_efficiency'] = self._calculate_resource_efficiency()
-                    else:
-                        result['unnecessary'] = True
-                else:
-                    result['action_invalid'] = True
-                    
+            await handler(action, result)
         except Exception as e:
             logger.error(f"Error executing DRL action: {e}")
-            result['action_invalid'] = True
+            result.action_invalid = True
         
         return result
     
+    async def _do_allocate(self, action: SFCAction, result: StepResult):
+        """Allocate an instance of the action's VNF type"""
+        success = await self.orchestrator.allocate_vnf(action.vnf_type)
+        if success:
+            self._resources_dirty = True
+            result.sfc_satisfied = True
+            result.resource_efficiency = self._calculate_resource_efficiency()
+        else:
+            result.action_invalid = True
+    
+    async def _do_uninstall(self, action: SFCAction, result: StepResult):
+        """Remove an instance of the action's VNF type if it is lightly loaded"""
+        instances = self.orchestrator.get_vnf_instances(action.vnf_type)
+        if instances:
+            load = self.orchestrator.get_vnf_load(action.vnf_type)
+            if load < 0.3:
+                await self.orchestrator.remove_vnf(action.vnf_type, instances[0])
+                self._resources_dirty = True
+                result.resource_efficiency = self._calculate_resource_efficiency()
+            else:
+                result.unnecessary = True
+        else:
+            result.action_invalid = True
+    
     async def _determine_scaling_action(self, current_load: float, resources: Dict) -> Optional[Dict]:
         """Determine if scaling action is needed"""
         scaling_action = None
@@ -432,65 +584,70 @@ class IntegratedNFVSystem:
             logger.error(f"Error creating SFC: {e}")
             self.metrics['sfc_dropped'] += 1
     
-    def _get_current_load(self) -> float:
+    def _resources(self, max_age: Optional[float] = None) -> Dict[str, float]:
+        """Get orchestrator resources, memoized until marked dirty or, when
+        max_age is given, until the snapshot is max_age seconds old"""
+        now = time.monotonic()
+        if self._resources_dirty or (max_age is not None and now - self._resources_ts >= max_age):
+            self._resources_cache = self.orchestrator.get_available_resources()
+            self._resources_dirty = False
+            self._resources_ts = now
+        return self._resources_cache
+    
+    def _get_current_load(self, resources: Optional[Dict] = None) -> float:
         """Get current system load"""
-        resources = self.orchestrator.get_available_resources()
-        total_cpu = resources.get('cpu_total', 8)
-        total_memory = resources.get('memory_total', 16)
-        
-        used_cpu = total_cpu - resources.get('cpu_available', 0)
-        used_memory = total_memory - resources.get('memory_available', 0)
-        
-        cpu_load = used_cpu / total_cpu
-        memory_load = used_memory / total_memory
-        
-        return (cpu_load + memory_load) / 2
+        if resources is None:
+            resources = self.orchestrator.get_available_resources()
+        get = resources.get
+        return _compute_load(get('cpu_total', 8), get('memory_total', 16),
+                             get('cpu_available', 0), get('memory_available', 0))
     
     def _calculate_resource_efficiency(self) -> float:
         """Calculate resource efficiency"""
-        return self._get_current_load()
+        return self._get_current_load(self._resources())
     
     def _select_vnf_for_scaling(self) -> str:
         """Select VNF type for scaling out"""
-        vnf_types = ['firewall', 'spamfilter', 'contentfilter', 'encryption']
-        
-        # Find VNF with highest load
-        max_load = 0
-        selected_vnf = vnf_types[0]
-        
-        for vnf_type in vnf_types:
-            load = self.orchestrator.get_vnf_load(vnf_type)
-            if load > max_load:
-                max_load = load
-                selected_vnf = vnf_type
-        
-        return selected_vnf
+        # VNF with highest load; ties (e.g. all idle) go to the first type
+        return max(VNF_TYPES, key=self.orchestrator.get_vnf_load)
     
     def _select_vnf_for_removal(self) -> str:
         """Select VNF type for scaling in"""
-        vnf_types = ['firewall', 'spamfilter', 'contentfilter', 'encryption']
-        
-        # Find VNF with lowest load
-        min_load = float('inf')
-        selected_vnf = vnf_types[0]
-        
-        for vnf_type in vnf_types:
-            instances = self.orchestrator.get_vnf_instances(vnf_type)
-            if len(instances) > 1:  # Only consider if multiple instances exist
-                load = self.orchestrator.get_vnf_load(vnf_type)
-                if load < min_load:
-                    min_load = load
-                    selected_vnf = vnf_type
-        
-        return selected_vnf
+        # Lowest-load VNF among types with more than one instance; loads are
+        # only read for those candidates
+        get_instances = self.orchestrator.get_vnf_instances
+        candidates = [vnf_type for vnf_type in VNF_TYPES if len(get_instances(vnf_type)) > 1]
+        return min(candidates, key=self.orchestrator.get_vnf_load, default=VNF_TYPES[0])
     
     def _update_system_metrics(self):
         """Update system metrics"""
-        self.metrics['resource_efficiency'] = self._calculate_resource_efficiency()
+        self.metrics['resource_efficiency'] = self._get_current_load(
+            self._resources(self.resources_max_age))
         
         # Calculate average latency (simulated)
         if self.metrics['sfc_satisfied'] > 0:
             self.metrics['average_latency'] = 100 + (self.metrics['resource_efficiency'] * 200)
+        
+        # Publish to Prometheus so dashboards read the registry, not the logs
+        for key, gauge in self._metric_gauges.items():
+            gauge.set(self.metrics[key])
+    
+    def _append_metrics_record(self):
+        """Append the current metrics snapshot as one JSONL line"""
+        if not self.metrics_log_path:
+            return
+        if self._metrics_log is None:
+            self._metrics_log = open(self.metrics_log_path, 'a', encoding='utf-8')
+        # Left to the file's buffering; shutdown() closes (and so flushes) it
+        self._metrics_log.write(json.dumps({'timestamp': time.time(), **self.metrics}) + '\n')
+    
+    async def _shutdown_executor(self):
+        """Shut the worker pool down without blocking the event loop"""
+        # The pool is also the loop's default executor, so it cannot join its
+        # own workers through asyncio.to_thread; a one-off thread waits instead
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=1) as closer:
+            await loop.run_in_executor(closer, self.executor.shutdown, True)
     
     async def shutdown(self):
         """Graceful shutdown"""
@@ -498,13 +655,33 @@ class IntegratedNFVSystem:
         self.running = False
         self.shutdown_event.set()
         
+        # Stop the loops first so none can submit new executor work, then let
+        # in-flight training/forecast jobs finish so the model isn't saved
+        # mid-update
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._shutdown_executor()
+        
+        self.sdn_controller.close()
+        
         # Save DRL model
         if self.drl_agent:
             self.drl_agent.save_model('models/drl_vnf_agent_final.pth')
         
-        # Save system metrics
-        with open('system_metrics.json', 'w') as f:
-            json.dump(self.metrics, f, indent=2)
+        # Close the incremental metrics log and save the final summary
+        if self._metrics_log is not None:
+            self._metrics_log.close()
+            self._metrics_log = None
+        
+        if ORJSON_AVAILABLE:
+            with open('system_metrics.json', 'wb') as f:
+                f.write(orjson.dumps(self.metrics,
+                                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open('system_metrics.json', 'w') as f:
+                json.dump(self.metrics, f, indent=2)
         
         logger.info("System shutdown completed")
 
@@ -547,4 +724,7 @@ async def main():
         await system.shutdown()
 
 if __name__ == "__main__":
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
     asyncio.run(main())
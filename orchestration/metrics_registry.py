@@ -5,11 +5,15 @@ Prevents metric collisions and provides consistent metrics across all VNF compon
 """
 
 import logging
+from functools import lru_cache
 from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
 from typing import Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Shared default for unlabelled metrics; prometheus_client accepts any sequence
+_EMPTY_LABELS: tuple = ()
+
 class MetricsRegistry:
     """Centralized metrics registry to prevent duplicate metric registration"""
     
@@ -30,35 +34,28 @@ class MetricsRegistry:
             self._initialized = True
             logger.info("Metrics Registry initialized")
     
-    def get_or_create_counter(self, name: str, description: str, labels: list = None) -> Counter:
-        """Get existing counter or create new one"""
-        if name in self._metrics:
-            return self._metrics[name]
+    def _get_or_create(self, metric_cls, name: str, description: str, labels: tuple = _EMPTY_LABELS):
+        """Return the metric registered under name, creating a metric_cls on first use"""
+        metric = self._metrics.get(name)
+        if metric is not None:
+            return metric
         
-        counter = Counter(name, description, labels or [], registry=self._registry)
-        self._metrics[name] = counter
-        logger.debug(f"Created counter metric: {name}")
-        return counter
+        metric = metric_cls(name, description, labels, registry=self._registry)
+        self._metrics[name] = metric
+        logger.debug(f"Created {metric_cls.__name__.lower()} metric: {name}")
+        return metric
+    
+    def get_or_create_counter(self, name: str, description: str, labels: tuple = _EMPTY_LABELS) -> Counter:
+        """Get existing counter or create new one"""
+        return self._get_or_create(Counter, name, description, labels)
     
-    def get_or_create_gauge(self, name: str, description: str, labels: list = None) -> Gauge:
+    def get_or_create_gauge(self, name: str, description: str, labels: tuple = _EMPTY_LABELS) -> Gauge:
         """Get existing gauge or create new one"""
-        if name in self._metrics:
-            return self._metrics[name]
-        
-        gauge = Gauge(name, description, labels or [], registry=self._registry)
-        self._metrics[name] = gauge
-        logger.debug(f"Created gauge metric: {name}")
-        return gauge
+        return self._get_or_create(Gauge, name, description, labels)
     
-    def get_or_create_histogram(self, name: str, description: str, labels: list = None) -> Histogram:
+    def get_or_create_histogram(self, name: str, description: str, labels: tuple = _EMPTY_LABELS) -> Histogram:
         """Get existing histogram or create new one"""
-        if name in self._metrics:
-            return self._metrics[name]
-        
-        histogram = Histogram(name, description, labels or [], registry=self._registry)
-        self._metrics[name] = histogram
-        logger.debug(f"Created histogram metric: {name}")
-        return histogram
+        return self._get_or_create(Histogram, name, description, labels)
     
     def get_metric(self, name: str):
         """Get existing metric by name"""
@@ -86,54 +83,56 @@ class MetricsRegistry:
 metrics_registry = MetricsRegistry()
 
 # Pre-defined metrics for VNF Orchestrator
+@lru_cache(maxsize=None)
 def get_vnf_orchestrator_metrics():
-    """Get all VNF Orchestrator metrics"""
+    """Get all VNF Orchestrator metrics (one shared dict per process)"""
     return {
         'vnf_instances': metrics_registry.get_or_create_gauge(
             'vnf_instances_total', 
             'Total VNF instances', 
-            ['vnf_type']
+            ('vnf_type',)
         ),
         'vnf_cpu_usage': metrics_registry.get_or_create_gauge(
             'vnf_cpu_usage', 
             'CPU usage per VNF instance', 
-            ['vnf_type', 'instance_id']
+            ('vnf_type', 'instance_id')
         ),
         'vnf_memory_usage': metrics_registry.get_or_create_gauge(
             'vnf_memory_usage', 
             'Memory usage per VNF instance', 
-            ['vnf_type', 'instance_id']
+            ('vnf_type', 'instance_id')
         ),
         'vnf_processing_latency': metrics_registry.get_or_create_gauge(
             'vnf_processing_latency', 
             'Processing latency per VNF instance', 
-            ['vnf_type', 'instance_id']
+            ('vnf_type', 'instance_id')
         ),
         'vnf_packets_processed': metrics_registry.get_or_create_counter(
             'vnf_packets_processed', 
             'Packets processed per VNF instance', 
-            ['vnf_type', 'instance_id']
+            ('vnf_type', 'instance_id')
         ),
         'scaling_actions': metrics_registry.get_or_create_counter(
             'scaling_actions_total', 
             'Total scaling actions', 
-            ['vnf_type', 'action']
+            ('vnf_type', 'action')
         ),
         'forecast_accuracy': metrics_registry.get_or_create_histogram(
             'forecast_accuracy', 
             'ARIMA forecast accuracy', 
-            ['vnf_type', 'metric']
+            ('vnf_type', 'metric')
         )
     }
 
 # Pre-defined metrics for VNFs
+@lru_cache(maxsize=None)
 def get_vnf_metrics(vnf_type: str):
-    """Get metrics for a specific VNF type"""
+    """Get metrics for a specific VNF type (one shared dict per type)"""
     return {
         'emails_scanned_total': metrics_registry.get_or_create_counter(
             f'{vnf_type}_emails_scanned_total',
             f'Total items scanned by {vnf_type}',
-            ['result']
+            ('result',)
         ),
         'scan_duration_seconds': metrics_registry.get_or_create_histogram(
             f'{vnf_type}_scan_duration_seconds',
@@ -142,12 +141,12 @@ def get_vnf_metrics(vnf_type: str):
         'processing_latency': metrics_registry.get_or_create_gauge(
             f'{vnf_type}_processing_latency',
             f'Processing latency for {vnf_type}',
-            ['instance_id']
+            ('instance_id',)
         ),
         'packets_processed': metrics_registry.get_or_create_counter(
             f'{vnf_type}_packets_processed',
             f'Packets processed by {vnf_type}',
-            ['instance_id']
+            ('instance_id',)
         )
     }
 
@@ -8,9 +8,12 @@ import json
 import logging
 import threading
 import time
-from typing import Dict, List, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from flask import Flask, request, jsonify
 import requests
+from requests.adapters import HTTPAdapter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -23,9 +26,18 @@ class SDNController:
         self.port = port
         self.app = Flask(__name__)
         self.flow_rules = {}
+        # Secondary indexes over flow_rules, kept in step by _add_flow_rule/_remove_flow_rule
+        self._flows_by_instance: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self._flows_by_vnf: Dict[str, Dict[str, Dict]] = defaultdict(dict)
         self.vnf_instances = {}
         self.load_balancer = LoadBalancer()
         
+        # Health checks reuse pooled keep-alive connections and run concurrently
+        self._hc_session = requests.Session()
+        self._hc_session.mount('http://', HTTPAdapter(pool_connections=64, pool_maxsize=64))
+        self._hc_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='sdn-health')
+        self._stopped = threading.Event()  # set by close() to end the health loop
+        
         # Register Flask routes
         self._register_routes()
         
@@ -38,6 +50,8 @@ class SDNController:
         try:
             # Initialize flow rules
             self.flow_rules = {}
+            self._flows_by_instance.clear()
+            self._flows_by_vnf.clear()
             logger.info("Flow rules initialized")
             
             # Initialize VNF instances tracking
@@ -130,7 +144,11 @@ class SDNController:
                 'created_at': time.time()
             }
             
+            if flow_id in self.flow_rules:
+                self._unindex_flow(self.flow_rules[flow_id])
             self.flow_rules[flow_id] = flow_rule
+            self._flows_by_instance[(vnf_type, instance_id)].add(flow_id)
+            self._flows_by_vnf[vnf_type][flow_id] = flow_rule
             logger.info(f"Added flow rule: {flow_id} -> {vnf_type}:{instance_id}")
             return True
             
@@ -162,8 +180,9 @@ class SDNController:
     def _remove_flow_rule(self, flow_id: str) -> bool:
         """Remove a flow rule"""
         try:
-            if flow_id in self.flow_rules:
-                del self.flow_rules[flow_id]
+            flow_rule = self.flow_rules.pop(flow_id, None)
+            if flow_rule is not None:
+                self._unindex_flow(flow_rule)
                 logger.info(f"Removed flow rule: {flow_id}")
                 return True
             return False
@@ -172,6 +191,21 @@ class SDNController:
             logger.error(f"Error removing flow rule: {e}")
             return False
     
+    def _unindex_flow(self, flow_rule: Dict):
+        """Drop a flow rule from the secondary indexes"""
+        flow_id = flow_rule['flow_id']
+        key = (flow_rule['vnf_type'], flow_rule['instance_id'])
+        flow_ids = self._flows_by_instance.get(key)
+        if flow_ids is not None:
+            flow_ids.discard(flow_id)
+            if not flow_ids:
+                del self._flows_by_instance[key]
+        vnf_flows = self._flows_by_vnf.get(flow_rule['vnf_type'])
+        if vnf_flows is not None:
+            vnf_flows.pop(flow_id, None)
+            if not vnf_flows:
+                del self._flows_by_vnf[flow_rule['vnf_type']]
+    
     def _add_vnf_instance(self, vnf_type: str, instance_id: str, ip_address: str, port: int = 8080) -> bool:
         """Add a VNF instance to the controller"""
         try:
@@ -221,13 +255,7 @@ class SDNController:
                 
             elif action == 'remove':
                 # Remove flow rules for the instance being removed
-                flows_to_remove = []
-                for flow_id, flow_rule in self.flow_rules.items():
-                    if (flow_rule['vnf_type'] == vnf_type and 
-                        flow_rule['instance_id'] == instance_id):
-                        flows_to_remove.append(flow_id)
-                
-                for flow_id in flows_to_remove:
+                for flow_id in list(self._flows_by_instance.get((vnf_type, instance_id), ())):
                     self._remove_flow_rule(flow_id)
                 
                 return True
@@ -240,33 +268,41 @@ class SDNController:
     
     def get_flow_rules_for_vnf(self, vnf_type: str) -> List[Dict]:
         """Get all flow rules for a specific VNF type"""
-        return [flow for flow in self.flow_rules.values() if flow['vnf_type'] == vnf_type]
+        return list(self._flows_by_vnf.get(vnf_type, {}).values())
     
     def health_check_instances(self):
         """Perform health checks on VNF instances"""
-        while True:
+        while not self._stopped.is_set():
             try:
-                for vnf_type, instances in self.vnf_instances.items():
-                    for instance in instances[:]:  # Copy list to avoid modification during iteration
-                        if not self._check_instance_health(instance):
-                            logger.warning(f"Unhealthy instance detected: {vnf_type}:{instance['instance_id']}")
-                            # Mark as unhealthy but don't remove immediately
-                            instance['status'] = 'unhealthy'
-                        else:
-                            instance['status'] = 'active'
-                            instance['health_check'] = time.time()
+                # Snapshot so instances can be added or removed during the sweep
+                targets = [(vnf_type, instance)
+                           for vnf_type, instances in list(self.vnf_instances.items())
+                           for instance in instances[:]]
+                results = self._hc_executor.map(self._check_instance_health,
+                                                [instance for _, instance in targets])
+                
+                for (vnf_type, instance), healthy in zip(targets, results):
+                    if not healthy:
+                        logger.warning(f"Unhealthy instance detected: {vnf_type}:{instance['instance_id']}")
+                        # Mark as unhealthy but don't remove immediately
+                        instance['status'] = 'unhealthy'
+                    else:
+                        instance['status'] = 'active'
+                        instance['health_check'] = time.time()
                 
-                time.sleep(30)  # Health check every 30 seconds
+                self._stopped.wait(30)  # Health check every 30 seconds
                 
             except Exception as e:
+                if self._stopped.is_set():
+                    break
                 logger.error(f"Error in health check: {e}")
-                time.sleep(30)
+                self._stopped.wait(30)
     
     def _check_instance_health(self, instance: Dict) -> bool:
         """Check health of a VNF instance"""
         try:
             url = f"http://{instance['ip_address']}:{instance['port']}/health"
-            response = requests.get(url, timeout=5)
+            response = self._hc_session.get(url, timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -280,11 +316,22 @@ class SDNController:
         health_thread.start()
         
         # Start Flask app
-        self.app.run(host='0.0.0.0', port=self.port, debug=False)
+        try:
+            self.app.run(host='0.0.0.0', port=self.port, debug=False)
+        finally:
+            self.close()
+    
+    def close(self):
+        """Stop health checking and release its worker threads and pooled connections"""
+        self._stopped.set()
+        self._hc_executor.shutdown(wait=False, cancel_futures=True)
+        self._hc_session.close()
 
     def clear_all_flows(self):
         """Clear all flow rules"""
         self.flow_rules.clear()
+        self._flows_by_instance.clear()
+        self._flows_by_vnf.clear()
         logger.info("All flow rules cleared")
 
 
@@ -8,8 +8,9 @@ import time
 import json
 import logging
 import threading
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import schedule
 import os
 from flask import Flask, jsonify
@@ -31,6 +32,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class OrchestratorSnapshot:
+    """Resources, instances, loads and SFC summary read together in one call"""
+    resources: Dict[str, float]
+    instances: Dict[str, List[str]]
+    loads: Dict[str, float]
+    active_sfcs: Dict
+
 class VNFOrchestrator:
     """Advanced VNF Orchestrator with ARIMA forecasting and rolling updates"""
     
@@ -582,6 +591,24 @@ class VNFOrchestrator:
             'average_latency': 50.0    # ms
         }
     
+    def get_state_snapshot(self, vnf_types: Optional[Iterable[str]] = None,
+                           resources: Optional[Dict[str, float]] = None) -> OrchestratorSnapshot:
+        """Read everything a scheduling decision needs in one pass.
+        
+        Instance lists are copied so the snapshot stays consistent if instances
+        are added or removed afterwards. Pass resources to reuse a reading the
+        caller already holds.
+        """
+        if vnf_types is None:
+            vnf_types = self.vnf_instances.keys()
+        instances = {vnf_type: list(self.vnf_instances.get(vnf_type, ())) for vnf_type in vnf_types}
+        return OrchestratorSnapshot(
+            resources=self.get_available_resources() if resources is None else resources,
+            instances=instances,
+            loads={vnf_type: self.get_vnf_load(vnf_type) for vnf_type in instances},
+            active_sfcs=self.get_active_sfcs()
+        )
+    
     async def allocate_vnf(self, vnf_type: str) -> bool:
         """Allocate a new VNF instance"""
         try: